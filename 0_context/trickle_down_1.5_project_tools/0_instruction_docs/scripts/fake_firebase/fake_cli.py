@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+"""
+fake_cli.py
+
+Offline stand-in for the firebase CLI and the helper scripts the Firebase
+orchestration system shells out to. Every command sleeps for a sampled
+latency, prints a configurable amount of output and then succeeds, fails or
+hangs, so scheduling, retry and timeout behavior can be load-tested without
+network access.
+
+Behavior comes from the JSON file named by FAKE_FIREBASE_CONFIG, or
+fake-firebase.json next to this file:
+
+    {
+        "seed": 42,
+        "state_file": ".fake-firebase-state.json",
+        "defaults": {
+            "latency": {"distribution": "lognormal", "median_seconds": 0.2, "sigma": 0.5},
+            "failure_rate": 0.0,
+            "failure_exit_code": 1,
+            "hang_rate": 0.0,
+            "hang_seconds": 3600,
+            "output_bytes": 200
+        },
+        "commands": {
+            "storage:rules": {"failure_rate": 0.3},
+            "firebase-backup.py": {"latency": {"distribution": "fixed", "seconds": 2}}
+        }
+    }
+
+Latency distributions are "fixed" (seconds), "uniform" (min_seconds,
+max_seconds) and "lognormal" (median_seconds, sigma). Commands are keyed by
+firebase subcommand or helper script name. Outcomes are drawn from a random
+generator seeded with the seed, the command line and how many times that
+command line has run before (tracked in state_file), so a run is repeatable
+while retries of the same command still see fresh draws.
+"""
+
+import fcntl
+import json
+import math
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake-firebase.json")
+
+DEFAULT_BEHAVIOR = {
+    "latency": {"distribution": "lognormal", "median_seconds": 0.2, "sigma": 0.5},
+    "failure_rate": 0.0,
+    "failure_exit_code": 1,
+    "hang_rate": 0.0,
+    "hang_seconds": 3600,
+    "output_bytes": 200
+}
+
+def load_config() -> Dict[str, Any]:
+    """Load the fake CLI configuration, falling back to defaults."""
+    config_file = os.environ.get("FAKE_FIREBASE_CONFIG", DEFAULT_CONFIG_FILE)
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+    # Resolve the state file relative to the config file
+    state_file = config.get("state_file")
+    if state_file and not os.path.isabs(state_file):
+        config["state_file"] = os.path.join(os.path.dirname(os.path.abspath(config_file)), state_file)
+    return config
+
+def get_behavior(config: Dict[str, Any], command: str) -> Dict[str, Any]:
+    """Merge the default behavior with the overrides for one command."""
+    behavior = {**DEFAULT_BEHAVIOR, **config.get("defaults", {})}
+    behavior.update(config.get("commands", {}).get(command, {}))
+    return behavior
+
+def next_invocation(state_file: str, key: str) -> int:
+    """Count invocations of a command line across processes."""
+    with open(state_file, 'a+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        content = f.read()
+        counts = json.loads(content) if content else {}
+        invocation = counts.get(key, 0)
+        counts[key] = invocation + 1
+        f.seek(0)
+        f.truncate()
+        json.dump(counts, f)
+    return invocation
+
+def sample_latency(rng: random.Random, latency: Dict[str, Any]) -> float:
+    """Draw a latency in seconds from the configured distribution."""
+    distribution = latency.get("distribution", "fixed")
+    if distribution == "fixed":
+        return float(latency.get("seconds", 0))
+    if distribution == "uniform":
+        return rng.uniform(latency.get("min_seconds", 0), latency.get("max_seconds", 1))
+    if distribution == "lognormal":
+        return rng.lognormvariate(math.log(latency.get("median_seconds", 0.2)), latency.get("sigma", 0.5))
+    raise ValueError(f"Unknown latency distribution: {distribution}")
+
+def write_output(stream, label: str, size: int):
+    """Write roughly size bytes of CLI-like output."""
+    line = f"i  {label}: " + "." * 60 + "\n"
+    remaining = size
+    while remaining > 0:
+        chunk = line[:remaining]
+        stream.write(chunk)
+        remaining -= len(chunk)
+    stream.flush()
+
+def run(command: str, argv: List[str]) -> int:
+    """Simulate one command and return its exit code."""
+    config = load_config()
+    behavior = get_behavior(config, command)
+
+    key = " ".join([command] + argv)
+    invocation = next_invocation(config["state_file"], key) if config.get("state_file") else 0
+    rng = random.Random(f"{config.get('seed', 0)}:{key}:{invocation}")
+
+    time.sleep(sample_latency(rng, behavior["latency"]))
+
+    outcome = rng.random()
+    if outcome < behavior["hang_rate"]:
+        write_output(sys.stdout, command, behavior["output_bytes"])
+        time.sleep(behavior["hang_seconds"])
+        return behavior["failure_exit_code"]
+
+    write_output(sys.stdout, command, behavior["output_bytes"])
+    if outcome < behavior["hang_rate"] + behavior["failure_rate"]:
+        sys.stderr.write(f"Error: simulated failure of {command} (invocation {invocation})\n")
+        return behavior["failure_exit_code"]
+
+    print(f"✔  {command} complete")
+    return 0
+
+def main_firebase() -> int:
+    """Entry point for the fake firebase executable."""
+    args = sys.argv[1:]
+    if not args:
+        sys.stderr.write("Usage: firebase <command> [options]\n")
+        return 1
+    return run(args[0], args[1:])
+
+def main_script(script_path: str) -> int:
+    """Entry point for the fake helper scripts."""
+    return run(os.path.basename(script_path), sys.argv[1:])
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+
+"""Fake helper script, see ../fake_cli.py."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_cli import main_script
+
+if __name__ == "__main__":
+    sys.exit(main_script(__file__))
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+
+"""
+firebase_benchmark.py
+
+Scale benchmarks for the Firebase orchestration system.
+Generates synthetic configurations of N environments x 10 integrations x M goals,
+times and measures the peak memory of the hot paths, and compares the results
+against a stored baseline so scaling regressions are caught early.
+
+Usage:
+    python3 firebase_benchmark.py --environments 3 30 300 --goals 4 40
+    python3 firebase_benchmark.py --save-baseline benchmark-baseline.json
+    python3 firebase_benchmark.py --baseline benchmark-baseline.json --tolerance 1.25
+    python3 firebase_benchmark.py --benchmark import_time
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from firebase_orchestration_system import FirebaseOrchestrationSystem, IntegrationType
+
+FAKE_FIREBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_firebase")
+ENVIRONMENT_TYPES = ["development", "staging", "production"]
+
+# Extra integration configuration so every IntegrationType is configured
+EXTRA_INTEGRATION_CONFIG = {
+    "analytics": {"data_retention_months": 14, "export_enabled": False},
+    "ci_cd": {"provider": "github_actions", "preview_channels": True}
+}
+
+def build_orchestration_config(num_environments: int) -> Dict[str, Any]:
+    """Synthetic orchestration config with every integration in every environment."""
+    config = FirebaseOrchestrationSystem.get_default_configuration()
+    config["system"].update({
+        "deployment_cache_file": None,
+        "duration_history_file": None,
+        "state_store_file": None,
+        "health_check_cache_ttl_seconds": 0,
+        "cli": {
+            "firebase": os.path.join(FAKE_FIREBASE_DIR, "firebase"),
+            "python": sys.executable,
+            "scripts_dir": os.path.join(FAKE_FIREBASE_DIR, "scripts")
+        }
+    })
+    config["integrations"].update(EXTRA_INTEGRATION_CONFIG)
+    config["environments"] = {
+        f"env-{i:05d}": {
+            "type": ENVIRONMENT_TYPES[i % len(ENVIRONMENT_TYPES)],
+            "project_id": f"bench-project-{i:05d}",
+            "region": "us-central1",
+            "integrations": [integration.value for integration in IntegrationType],
+            "auto_deploy": False,
+            "monitoring_enabled": True
+        }
+        for i in range(num_environments)
+    }
+    return config
+
+def build_master_config(environments: List[str], num_goals: int, seed: int = 0) -> Dict[str, Any]:
+    """Synthetic master config with goals spread over the environments."""
+    from firebase_master_orchestrator import FirebaseMasterOrchestrator
+
+    rng = random.Random(seed)
+    config = FirebaseMasterOrchestrator.get_default_master_configuration()
+    integrations = [integration.value for integration in IntegrationType]
+    config["goals"] = {
+        f"goal_{j:04d}": {
+            "name": f"Synthetic Goal {j}",
+            "description": "Synthetic benchmark goal",
+            "priority": rng.randint(1, 3),
+            "target_environments": rng.sample(environments, max(1, len(environments) // 2)),
+            "required_integrations": rng.sample(integrations, 3),
+            "success_criteria": {"score": rng.randint(50, 100)}
+        }
+        for j in range(num_goals)
+    }
+    return config
+
+class Scenario:
+    """A synthetic configuration written to its own working directory."""
+
+    def __init__(self, num_environments: int, num_goals: int):
+        self.num_environments = num_environments
+        self.num_goals = num_goals
+        self.name = f"environments={num_environments},goals={num_goals}"
+        self.directory = tempfile.mkdtemp(prefix="firebase-benchmark-")
+        self.config = build_orchestration_config(num_environments)
+        self._write("orchestration-config.json", self.config)
+        # Health probes hit the fake CLI with no latency so only orchestration overhead is measured
+        self._write("fake-firebase.json", {"seed": 0, "defaults": {"latency": {"distribution": "fixed", "seconds": 0}}})
+
+    @contextlib.contextmanager
+    def active(self) -> Iterator["Scenario"]:
+        """Point the fake CLI at this scenario's behavior file until the block exits."""
+        previous = os.environ.get("FAKE_FIREBASE_CONFIG")
+        os.environ["FAKE_FIREBASE_CONFIG"] = os.path.join(self.directory, "fake-firebase.json")
+        try:
+            yield self
+        finally:
+            if previous is None:
+                del os.environ["FAKE_FIREBASE_CONFIG"]
+            else:
+                os.environ["FAKE_FIREBASE_CONFIG"] = previous
+
+    def _write(self, file_name: str, content: Dict[str, Any]):
+        with open(os.path.join(self.directory, file_name), 'w') as f:
+            json.dump(content, f)
+
+    def create_system(self) -> FirebaseOrchestrationSystem:
+        return FirebaseOrchestrationSystem(os.path.join(self.directory, "orchestration-config.json"))
+
+    def create_master(self):
+        from firebase_master_orchestrator import FirebaseMasterOrchestrator
+
+        self._write("master-orchestration-config.json",
+                    build_master_config(list(self.config["environments"]), self.num_goals))
+        # The master orchestrator reads its configs from the working directory
+        previous_directory = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            return FirebaseMasterOrchestrator()
+        finally:
+            os.chdir(previous_directory)
+
+async def plan_all_environments(system: FirebaseOrchestrationSystem):
+    """Plan and dependency-sort a full deployment of every environment."""
+    for environment in system.environments.values():
+        await system.plan_deployment(environment.name, environment.integrations)
+
+def planned_system(scenario: Scenario) -> FirebaseOrchestrationSystem:
+    system = scenario.create_system()
+    asyncio.run(plan_all_environments(system))
+    return system
+
+def reset_system(scenario: Scenario) -> FirebaseOrchestrationSystem:
+    system = scenario.create_system()
+    system.environments.clear()
+    system.integrations.clear()
+    return system
+
+# name -> (setup, run); setup builds fresh state outside the measurement
+BENCHMARKS: Dict[str, Tuple[Callable[[Scenario], Any], Callable[[Any], Any]]] = {
+    "initialize_system": (reset_system, lambda system: system.initialize_system()),
+    "plan_deployment": (lambda scenario: scenario.create_system(),
+                        lambda system: asyncio.run(plan_all_environments(system))),
+    "health_check": (planned_system, lambda system: asyncio.run(system.health_check(force_refresh=True))),
+    "generate_report": (planned_system, lambda system: system.generate_report()),
+    "create_dashboard": (lambda scenario: _visual_orchestrator(planned_system(scenario)),
+                         lambda visual: visual.create_dashboard()),
+    "plan_system_architecture": (lambda scenario: scenario.create_master(),
+                                 lambda master: asyncio.run(master.plan_system_architecture(
+                                     list(master.goals), list(master.constraints)))),
+}
+
+# Entry point module -> import-time budget in seconds; cron-driven health runs
+# import these on every invocation, so start-up must stay cheap
+IMPORT_TIME_BUDGETS: Dict[str, float] = {
+    "firebase_orchestration_system": 0.15,
+    "firebase_visual_orchestrator": 0.15,
+    "firebase_master_orchestrator": 0.15,
+}
+
+def _visual_orchestrator(system: FirebaseOrchestrationSystem):
+    from firebase_visual_orchestrator import FirebaseVisualOrchestrator
+    return FirebaseVisualOrchestrator(system)
+
+def measure(scenario: Scenario, setup: Callable, run: Callable, repeat: int) -> Dict[str, Any]:
+    """Time a benchmark repeat times, then measure its peak memory once."""
+    timings = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            state = setup(scenario)
+            started = time.perf_counter()
+            run(state)
+            timings.append(time.perf_counter() - started)
+
+        # Tracing slows everything down, so memory is measured in a separate pass
+        state = setup(scenario)
+        tracemalloc.start()
+        try:
+            run(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "peak_memory_bytes": peak,
+        "repeat": repeat
+    }
+
+def measure_task_memory(scenario: Scenario, plans_per_environment: int = 10) -> Dict[str, Any]:
+    """Retained memory per Task after planning every environment repeatedly, as fleet history accumulates."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        system = scenario.create_system()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            for _ in range(plans_per_environment):
+                asyncio.run(plan_all_environments(system))
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "tasks": len(system.tasks),
+        "bytes_per_task": round((after - before) / max(1, len(system.tasks)), 1)
+    }
+
+def parse_import_times(stderr: str, module: str) -> Tuple[int, Dict[str, int]]:
+    """Cumulative microseconds for module and for each of its direct imports, from -X importtime output."""
+    children: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nested imports indented two spaces per level
+        fields = line.split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        depth = (len(fields[2]) - len(fields[2].lstrip()) - 1) // 2
+        # A package is reported after everything it imported
+        if depth == 0:
+            if name == module:
+                return int(fields[1]), children
+            children = {}
+        elif depth == 1:
+            children[name] = int(fields[1])
+    raise ValueError(f"{module} not found in import time output")
+
+def measure_import_time(module: str, repeat: int) -> Dict[str, Any]:
+    """Import time of a module in a fresh interpreter, against its budget."""
+    timings = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        )
+        cumulative, children = parse_import_times(completed.stderr, module)
+        timings.append(cumulative / 1e6)
+
+    budget = IMPORT_TIME_BUDGETS.get(module)
+    seconds = statistics.median(timings)
+    heaviest = sorted(children.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        "seconds": seconds,
+        "budget_seconds": budget,
+        "within_budget": budget is None or seconds <= budget,
+        "heaviest_imports": {name: microseconds / 1e6 for name, microseconds in heaviest},
+        "repeat": repeat
+    }
+
+def run_benchmarks(environment_counts: List[int], goal_counts: List[int], repeat: int,
+                   selected: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run every selected benchmark for every scenario size."""
+    results: Dict[str, Any] = {
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {},
+        "memory_per_task": {},
+        "import_time": {},
+        "skipped": {}
+    }
+
+    if not selected or "import_time" in selected:
+        for module in IMPORT_TIME_BUDGETS:
+            results["import_time"][module] = measure_import_time(module, max(repeat, 5))
+            result = results["import_time"][module]
+            print(f"  {'import':<32} {module:<30} {result['seconds'] * 1000:6.1f} ms "
+                  f"(budget {result['budget_seconds'] * 1000:.0f} ms)", file=sys.stderr)
+
+    for num_environments in environment_counts:
+        for num_goals in goal_counts:
+            scenario = Scenario(num_environments, num_goals)
+            scenario_results = results["scenarios"].setdefault(scenario.name, {})
+            try:
+                with scenario.active():
+                    if not selected or "memory_per_task" in selected:
+                        results["memory_per_task"][scenario.name] = measure_task_memory(scenario)
+                        print(f"  {scenario.name:<32} {'memory_per_task':<26} "
+                              f"{results['memory_per_task'][scenario.name]['bytes_per_task']:10.1f} B/task",
+                              file=sys.stderr)
+                    for name, (setup, run) in BENCHMARKS.items():
+                        if selected and name not in selected:
+                            continue
+                        try:
+                            scenario_results[name] = measure(scenario, setup, run, repeat)
+                        except ImportError as e:
+                            # Optional dependencies (matplotlib, networkx) are not installed
+                            results["skipped"][name] = str(e)
+                            continue
+                        print(f"  {scenario.name:<32} {name:<26} {scenario_results[name]['seconds'] * 1000:10.2f} ms "
+                              f"{scenario_results[name]['peak_memory_bytes'] / 1024:10.0f} KiB", file=sys.stderr)
+            finally:
+                shutil.rmtree(scenario.directory, ignore_errors=True)
+
+    results["scaling"] = estimate_scaling(results["scenarios"])
+    return results
+
+def estimate_scaling(scenarios: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Log-log slope of time against environment count per benchmark and goal count (1.0 = linear)."""
+    points: Dict[Tuple[str, int], List[Tuple[int, float]]] = {}
+    for scenario_name, benchmarks in scenarios.items():
+        sizes = dict(part.split("=") for part in scenario_name.split(","))
+        for name, result in benchmarks.items():
+            points.setdefault((name, int(sizes["goals"])), []).append((int(sizes["environments"]), result["seconds"]))
+
+    scaling: Dict[str, Dict[str, float]] = {}
+    for (name, num_goals), samples in points.items():
+        samples.sort()
+        (small_n, small_t), (large_n, large_t) = samples[0], samples[-1]
+        if large_n > small_n and small_t > 0 and large_t > 0:
+            slope = math.log(large_t / small_t) / math.log(large_n / small_n)
+            scaling.setdefault(name, {})[f"goals={num_goals}"] = round(slope, 3)
+    return scaling
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """Ratios of current to baseline time and memory; anything above tolerance is a regression."""
+    comparison: Dict[str, Any] = {"tolerance": tolerance, "benchmarks": {}, "regressions": []}
+
+    for scenario_name, benchmarks in results["scenarios"].items():
+        for name, result in benchmarks.items():
+            previous = baseline.get("scenarios", {}).get(scenario_name, {}).get(name)
+            if previous is None:
+                continue
+            ratios = {
+                "seconds": result["seconds"] / previous["seconds"] if previous["seconds"] else None,
+                "peak_memory_bytes": (result["peak_memory_bytes"] / previous["peak_memory_bytes"]
+                                      if previous["peak_memory_bytes"] else None)
+            }
+            comparison["benchmarks"].setdefault(scenario_name, {})[name] = ratios
+            for metric, ratio in ratios.items():
+                if ratio is not None and ratio > tolerance:
+                    comparison["regressions"].append({
+                        "scenario": scenario_name,
+                        "benchmark": name,
+                        "metric": metric,
+                        "baseline": previous[metric],
+                        "current": result[metric],
+                        "ratio": round(ratio, 3)
+                    })
+
+    for scenario_name, result in results["memory_per_task"].items():
+        previous = baseline.get("memory_per_task", {}).get(scenario_name)
+        if not previous or not previous["bytes_per_task"]:
+            continue
+        ratio = result["bytes_per_task"] / previous["bytes_per_task"]
+        comparison["benchmarks"].setdefault(scenario_name, {})["memory_per_task"] = {"bytes_per_task": ratio}
+        if ratio > tolerance:
+            comparison["regressions"].append({
+                "scenario": scenario_name,
+                "benchmark": "memory_per_task",
+                "metric": "bytes_per_task",
+                "baseline": previous["bytes_per_task"],
+                "current": result["bytes_per_task"],
+                "ratio": round(ratio, 3)
+            })
+
+    return comparison
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scale benchmarks for the Firebase orchestration system")
+    parser.add_argument("--environments", type=int, nargs="+", default=[3, 30, 300],
+                        help="environment counts to generate")
+    parser.add_argument("--goals", type=int, nargs="+", default=[4, 40], help="goal counts to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (median is reported)")
+    parser.add_argument("--benchmark", action="append", choices=list(BENCHMARKS) + ["memory_per_task", "import_time"],
+                        help="run only these benchmarks")
+    parser.add_argument("--output", default="benchmark-results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="current/baseline ratio above which a metric counts as a regression")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.environments, args.goals, args.repeat, args.benchmark)
+
+    if args.baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                results["comparison"] = compare_with_baseline(results, json.load(f), args.tolerance)
+        else:
+            print(f"⚠️ Baseline not found, skipping comparison: {args.baseline}", file=sys.stderr)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+    print(f"📄 Benchmark results saved to: {args.output}", file=sys.stderr)
+
+    for name, reason in results["skipped"].items():
+        print(f"⏭️ Skipped {name}: {reason}", file=sys.stderr)
+
+    regressions = results.get("comparison", {}).get("regressions", [])
+    for regression in regressions:
+        print(f"❌ {regression['scenario']} {regression['benchmark']} {regression['metric']}: "
+              f"{regression['ratio']}x baseline", file=sys.stderr)
+    over_budget = [module for module, result in results["import_time"].items() if not result["within_budget"]]
+    for module in over_budget:
+        result = results["import_time"][module]
+        print(f"❌ import {module}: {result['seconds'] * 1000:.1f} ms exceeds the "
+              f"{result['budget_seconds'] * 1000:.0f} ms budget", file=sys.stderr)
+    return 1 if regressions or over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
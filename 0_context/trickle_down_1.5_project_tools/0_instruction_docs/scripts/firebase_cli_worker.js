@@ -0,0 +1,135 @@
+#!/usr/bin/env node
+
+/**
+ * firebase_cli_worker.js
+ *
+ * Long-lived firebase CLI worker for the Firebase orchestration system.
+ * Loads firebase-tools once and runs commands through its programmatic API,
+ * so each command skips Node start-up and CLI module loading.
+ *
+ * Protocol (JSON lines):
+ *   worker -> {"ready": true} or {"ready": false, "error": "..."} on start-up
+ *   parent -> {"id": 1, "args": ["firestore:indexes", "--project", "x"], "cwd": "...", "tail_bytes": 4000}
+ *   worker -> {"id": 1, "exit_code": 0, "stdout": "...", "stderr": "..."}
+ *          or {"id": 1, "unsupported": true} when the command has no programmatic equivalent
+ */
+
+const readline = require("readline");
+
+const writeProtocol = process.stdout.write.bind(process.stdout);
+const send = (message) => writeProtocol(JSON.stringify(message) + "\n");
+
+// CLI output written while a command runs is captured for the response;
+// anything else goes to stderr so stdout carries only protocol messages
+const writeStderr = process.stderr.write.bind(process.stderr);
+let captured = null;
+for (const [name, stream] of [["stdout", process.stdout], ["stderr", process.stderr]]) {
+  stream.write = (chunk, encoding, callback) => {
+    if (captured === null) {
+      return writeStderr(chunk, encoding, callback);
+    }
+    captured[name] += typeof chunk === "string" ? chunk : chunk.toString();
+    if (typeof encoding === "function") encoding();
+    else if (typeof callback === "function") callback();
+    return true;
+  };
+}
+
+let client;
+try {
+  client = require("firebase-tools");
+} catch (error) {
+  send({ ready: false, error: error.message });
+  process.exit(1);
+}
+
+function resolveCommand(name) {
+  let target = client;
+  for (const part of name.split(":")) {
+    target = target == null ? undefined : target[part];
+  }
+  return typeof target === "function" ? target : null;
+}
+
+function camelCase(flag) {
+  return flag.replace(/-([a-z])/g, (_, letter) => letter.toUpperCase());
+}
+
+function parseArgs(args, cwd) {
+  const positionals = [];
+  const options = { nonInteractive: true, cwd };
+  for (let i = 0; i < args.length; i++) {
+    const arg = args[i];
+    if (!arg.startsWith("--")) {
+      positionals.push(arg);
+      continue;
+    }
+    let [flag, value] = arg.slice(2).split(/=(.*)/s);
+    if (value === undefined) {
+      if (flag.startsWith("no-")) {
+        flag = flag.slice(3);
+        value = false;
+      } else if (i + 1 < args.length && !args[i + 1].startsWith("--")) {
+        value = args[++i];
+      } else {
+        value = true;
+      }
+    }
+    options[camelCase(flag)] = value;
+  }
+  return { positionals, options };
+}
+
+function tail(text, limit) {
+  return limit && text.length > limit ? text.slice(-limit) : text;
+}
+
+async function runCommand(request) {
+  const [name, ...rest] = request.args;
+  const command = resolveCommand(name || "");
+  if (command === null) {
+    return { id: request.id, unsupported: true };
+  }
+
+  const { positionals, options } = parseArgs(rest, request.cwd || process.cwd());
+  captured = { stdout: "", stderr: "" };
+  let exitCode = 0;
+  try {
+    const result = await command(...positionals, options);
+    if (result !== undefined) {
+      captured.stdout += JSON.stringify(result, null, 2) + "\n";
+    }
+  } catch (error) {
+    exitCode = error.exit || 1;
+    captured.stderr += `Error: ${error.message}\n`;
+  }
+  const output = captured;
+  captured = null;
+
+  return {
+    id: request.id,
+    exit_code: exitCode,
+    stdout: tail(output.stdout, request.tail_bytes),
+    stderr: tail(output.stderr, request.tail_bytes)
+  };
+}
+
+// The parent sends one request at a time; queue defensively anyway
+let queue = Promise.resolve();
+const lines = readline.createInterface({ input: process.stdin });
+lines.on("line", (line) => {
+  if (!line.trim()) return;
+  queue = queue.then(async () => {
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (error) {
+      send({ id: null, exit_code: 1, stdout: "", stderr: `Invalid request: ${error.message}` });
+      return;
+    }
+    send(await runCommand(request));
+  });
+});
+lines.on("close", () => queue.then(() => process.exit(0)));
+
+send({ ready: true });
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+
+"""
+firebase_command_runner.py
+
+Asynchronous command execution layer for the Firebase orchestration system.
+Runs the firebase CLI and helper scripts as asyncio subprocesses so that
+slow commands never block the event loop, either one process per command or
+through a pool of long-lived firebase CLI workers.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import json
+import os
+import signal
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+@dataclass
+class CommandResult:
+    """Structured result of a finished command."""
+    args: List[str]
+    exit_code: int
+    duration: float  # seconds
+    stdout_tail: str
+    stderr_tail: str
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command exited successfully."""
+        return self.exit_code == 0 and not self.timed_out
+
+class CommandTimeoutError(Exception):
+    """Raised when a command exceeds its timeout."""
+
+    def __init__(self, result: CommandResult, timeout: float):
+        super().__init__(f"Command timed out after {timeout:g}s: {' '.join(result.args)}")
+        self.result = result
+        self.timeout = timeout
+
+# Results of commands run in the current context, see record_commands()
+_command_log: contextvars.ContextVar[Optional[List[CommandResult]]] = contextvars.ContextVar(
+    "command_log", default=None
+)
+
+@contextlib.contextmanager
+def record_commands() -> Iterator[List[CommandResult]]:
+    """Collect the result of every command run in this context, including killed ones."""
+    log: List[CommandResult] = []
+    token = _command_log.set(log)
+    try:
+        yield log
+    finally:
+        _command_log.reset(token)
+
+class _OutputTail:
+    """Keeps only the last bytes of a stream so huge outputs stay bounded."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.data = bytearray()
+
+    def append(self, chunk: bytes):
+        self.data += chunk
+        if len(self.data) > 2 * self.limit:
+            del self.data[:-self.limit]
+
+    def text(self) -> str:
+        return bytes(self.data[-self.limit:]).decode("utf-8", errors="replace")
+
+class AsyncCommandRunner:
+    """Runs external commands as asyncio subprocesses with bounded concurrency."""
+
+    def __init__(self, max_concurrent: int = 5, default_timeout: Optional[float] = None,
+                 tail_bytes: int = 4000):
+        self.max_concurrent = max(1, max_concurrent)
+        self.default_timeout = default_timeout
+        self.tail_bytes = tail_bytes
+        # asyncio primitives bind to the event loop that first waits on them, so the slots
+        # are created per loop and the runner keeps working across asyncio.run() calls
+        self._slots_by_loop: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+    @property
+    def _slots(self) -> asyncio.Semaphore:
+        """The concurrency slots of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._slots_by_loop is None or self._slots_by_loop[0] is not loop:
+            self._slots_by_loop = (loop, asyncio.Semaphore(self.max_concurrent))
+        return self._slots_by_loop[1]
+
+    async def run(self, args: Sequence[str], timeout: Optional[float] = None, check: bool = False,
+                  cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> CommandResult:
+        """Run a command and return its result.
+
+        The command runs in its own process group; when the timeout passes, or the calling
+        task is cancelled, the whole group is killed and the output captured so far is kept.
+        With check=True a non-zero exit raises subprocess.CalledProcessError, matching
+        subprocess.run so existing error handling keeps working.
+        """
+        args = [str(arg) for arg in args]
+        timeout = self.default_timeout if timeout is None else timeout
+
+        async with self._slots:
+            started = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                start_new_session=True
+            )
+            stdout = _OutputTail(self.tail_bytes)
+            stderr = _OutputTail(self.tail_bytes)
+
+            timed_out = False
+            try:
+                await asyncio.wait_for(self._communicate(process, stdout, stderr), timeout=timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                await self._kill_process_group(process)
+            except asyncio.CancelledError:
+                # The caller's deadline passed; don't leave the children running
+                await self._kill_process_group(process)
+                self._record(CommandResult(
+                    args=args,
+                    exit_code=process.returncode,
+                    duration=time.perf_counter() - started,
+                    stdout_tail=stdout.text(),
+                    stderr_tail=stderr.text(),
+                    timed_out=True
+                ))
+                raise
+
+        result = CommandResult(
+            args=args,
+            exit_code=process.returncode,
+            duration=time.perf_counter() - started,
+            stdout_tail=stdout.text(),
+            stderr_tail=stderr.text(),
+            timed_out=timed_out
+        )
+        return self._finish(result, timeout, check)
+
+    async def close(self):
+        """Release any resources held by the runner."""
+
+    def _finish(self, result: CommandResult, timeout: Optional[float], check: bool) -> CommandResult:
+        """Record a result and raise for timeouts and, with check=True, failures."""
+        args = result.args
+        self._record(result)
+
+        if result.timed_out:
+            raise CommandTimeoutError(result, timeout)
+
+        if check and result.exit_code != 0:
+            raise subprocess.CalledProcessError(
+                result.exit_code, args, output=result.stdout_tail, stderr=result.stderr_tail
+            )
+
+        return result
+
+    async def _communicate(self, process: asyncio.subprocess.Process, stdout: _OutputTail, stderr: _OutputTail):
+        """Read both output streams to the end, then wait for the process to exit."""
+        await asyncio.gather(
+            self._drain(process.stdout, stdout),
+            self._drain(process.stderr, stderr)
+        )
+        await process.wait()
+
+    async def _drain(self, stream: asyncio.StreamReader, tail: _OutputTail):
+        """Read a stream incrementally so partial output survives a kill."""
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+            tail.append(chunk)
+
+    async def _kill_process_group(self, process: asyncio.subprocess.Process):
+        """Kill the process and every child it spawned."""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+    def _record(self, result: CommandResult):
+        """Append a result to the current command log, if one is being recorded."""
+        log = _command_log.get()
+        if log is not None:
+            log.append(result)
+
+class _CLIWorker:
+    """A long-lived firebase CLI worker process speaking JSON lines."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self._next_id = 0
+
+    @classmethod
+    async def start(cls, command: Sequence[str], startup_timeout: float) -> "_CLIWorker":
+        """Start a worker and wait for its ready message."""
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+            limit=2 ** 24
+        )
+        worker = cls(process)
+        try:
+            ready = await asyncio.wait_for(worker._read_message(), timeout=startup_timeout)
+        except BaseException:
+            await worker.kill()
+            raise
+        if not ready.get("ready"):
+            await worker.kill()
+            raise OSError(f"firebase CLI worker failed to start: {ready.get('error', 'unknown error')}")
+        return worker
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def request(self, args: Sequence[str], cwd: Optional[str], tail_bytes: int) -> Dict:
+        """Send one command and wait for its response."""
+        self._next_id += 1
+        message = {"id": self._next_id, "args": list(args), "cwd": cwd, "tail_bytes": tail_bytes}
+        self.process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+        response = await self._read_message()
+        if response.get("id") != self._next_id:
+            raise ValueError(f"Unexpected response from firebase CLI worker: {response}")
+        return response
+
+    async def _read_message(self) -> Dict:
+        line = await self.process.stdout.readline()
+        if not line:
+            raise ConnectionError("firebase CLI worker exited")
+        return json.loads(line)
+
+    async def kill(self):
+        """Kill the worker and anything the command it was running spawned."""
+        self.kill_now()
+        await self.process.wait()
+
+    def kill_now(self):
+        """Kill the worker without waiting for it to exit."""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except ProcessLookupError:
+            pass
+
+class WorkerPoolCommandRunner(AsyncCommandRunner):
+    """Runs firebase CLI commands on a pool of long-lived workers.
+
+    Each worker loads the CLI once, so commands skip Node start-up and module
+    loading. Commands for other executables, commands the worker cannot run
+    in-process, and every command after the pool fails to start fall back to
+    one process per command.
+    """
+
+    def __init__(self, max_concurrent: int = 5, default_timeout: Optional[float] = None,
+                 tail_bytes: int = 4000, worker_command: Optional[Sequence[str]] = None,
+                 pooled_executables: Sequence[str] = ("firebase",), startup_timeout: float = 30):
+        super().__init__(max_concurrent, default_timeout, tail_bytes)
+        self.worker_command = list(worker_command or [
+            "node", os.path.join(os.path.dirname(os.path.abspath(__file__)), "firebase_cli_worker.js")
+        ])
+        self.pooled_executables = set(pooled_executables)
+        self.startup_timeout = startup_timeout
+        self.available: Optional[bool] = None  # unknown until the first worker starts
+        self._idle_workers: List[_CLIWorker] = []
+        self._workers_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(self, args: Sequence[str], timeout: Optional[float] = None, check: bool = False,
+                  cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> CommandResult:
+        """Run a command on a pooled worker when possible, otherwise as its own process."""
+        args = [str(arg) for arg in args]
+        timeout = self.default_timeout if timeout is None else timeout
+
+        if env is None and self.available is not False and os.path.basename(args[0]) in self.pooled_executables:
+            async with self._slots:
+                result = await self._run_pooled(args, timeout, cwd)
+            if result is not None:
+                return self._finish(result, timeout, check)
+
+        return await super().run(args, timeout=timeout, check=check, cwd=cwd, env=env)
+
+    async def _run_pooled(self, args: List[str], timeout: Optional[float],
+                          cwd: Optional[str]) -> Optional[CommandResult]:
+        """Run a command on a worker; None means it should run as its own process instead."""
+        worker = await self._checkout()
+        if worker is None:
+            return None
+
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(worker.request(args[1:], cwd, self.tail_bytes), timeout=timeout)
+        except asyncio.TimeoutError:
+            await worker.kill()
+            return CommandResult(args, -signal.SIGKILL, time.perf_counter() - started, "", "", timed_out=True)
+        except asyncio.CancelledError:
+            await worker.kill()
+            self._record(CommandResult(args, -signal.SIGKILL, time.perf_counter() - started, "", "", timed_out=True))
+            raise
+        except (OSError, ValueError):
+            # The worker died or broke protocol mid-command; run this one the slow way
+            await worker.kill()
+            return None
+
+        self._idle_workers.append(worker)
+        if response.get("unsupported"):
+            return None
+
+        return CommandResult(
+            args=args,
+            exit_code=response["exit_code"],
+            duration=time.perf_counter() - started,
+            stdout_tail=response.get("stdout", ""),
+            stderr_tail=response.get("stderr", "")
+        )
+
+    async def _checkout(self) -> Optional[_CLIWorker]:
+        """Take an idle worker, starting a new one if none is free."""
+        loop = asyncio.get_running_loop()
+        if self._workers_loop is not loop:
+            # Workers started on an earlier event loop cannot be talked to from this one
+            for worker in self._idle_workers:
+                worker.kill_now()
+            self._idle_workers = []
+            self._workers_loop = loop
+
+        while self._idle_workers:
+            worker = self._idle_workers.pop()
+            if worker.alive:
+                return worker
+
+        try:
+            worker = await _CLIWorker.start(self.worker_command, self.startup_timeout)
+        except (OSError, ValueError, asyncio.TimeoutError) as e:
+            if self.available is None:
+                print(f"⚠️ firebase CLI worker pool unavailable, spawning one process per command: {e}")
+            self.available = False
+            return None
+
+        self.available = True
+        return worker
+
+    async def close(self):
+        """Stop all idle workers."""
+        workers, self._idle_workers = self._idle_workers, []
+        for worker in workers:
+            await worker.kill()
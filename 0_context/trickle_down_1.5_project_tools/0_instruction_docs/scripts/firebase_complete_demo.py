@@ -8,7 +8,6 @@ This demonstrates all capabilities: planning, implementation, management, and op
 """
 
 import asyncio
-import json
 import os
 import time
 from datetime import datetime, timedelta
@@ -16,16 +15,19 @@ from typing import Dict, List, Optional, Any
 
 # Import our orchestration components
 from firebase_orchestration_system import FirebaseOrchestrationSystem, EnvironmentType, IntegrationType, TaskStatus
-from firebase_visual_orchestrator import FirebaseVisualOrchestrator
-from firebase_master_orchestrator import FirebaseMasterOrchestrator, OrchestrationMode
+from firebase_orchestration_context import OrchestrationContext
+from firebase_master_orchestrator import OrchestrationMode
+import firebase_serialization
 
 class FirebaseCompleteDemo:
     """Comprehensive demo of the Firebase Master Orchestration System."""
     
     def __init__(self):
-        self.orchestration_system = FirebaseOrchestrationSystem()
-        self.visual_orchestrator = FirebaseVisualOrchestrator(self.orchestration_system)
-        self.master_orchestrator = FirebaseMasterOrchestrator()
+        # One shared core, so every phase reports on the state the deploys changed
+        self.context = OrchestrationContext()
+        self.orchestration_system = self.context.system
+        self.visual_orchestrator = self.context.visual
+        self.master_orchestrator = self.context.master
         
         self.demo_results = {
             "timestamp": datetime.now().isoformat(),
@@ -86,7 +88,7 @@ class FirebaseCompleteDemo:
         
         # Save architecture plan
         with open("demo-architecture-plan.json", "w") as f:
-            json.dump(architecture_plan, f, indent=2, default=str)
+            firebase_serialization.dump(architecture_plan, f, indent=2, typed=True)
         
         print("✅ Architecture planning complete")
         print(f"📄 Architecture plan saved: demo-architecture-plan.json")
@@ -108,7 +110,7 @@ class FirebaseCompleteDemo:
         
         # Load architecture plan
         with open("demo-architecture-plan.json", "r") as f:
-            architecture_plan = json.load(f)
+            architecture_plan = firebase_serialization.load(f, typed=True)
         
         # Implement system architecture
         print("🏗️ Implementing system architecture...")
@@ -121,7 +123,7 @@ class FirebaseCompleteDemo:
             print("\n📊 Implementation Results:")
             print(f"   • Environments Deployed: {len(self.orchestration_system.environments)}")
             print(f"   • Integrations Configured: {len(self.orchestration_system.integrations)}")
-            print(f"   • Tasks Completed: {len([t for t in self.orchestration_system.tasks.values() if t.status == TaskStatus.COMPLETED])}")
+            print(f"   • Tasks Completed: {self.orchestration_system.task_counters.count(TaskStatus.COMPLETED)}")
             
             self.demo_results["phases_completed"].append("implementation")
         else:
@@ -294,7 +296,7 @@ class FirebaseCompleteDemo:
         
         # Save demo results
         with open("demo-results.json", "w") as f:
-            json.dump(self.demo_results, f, indent=2, default=str)
+            firebase_serialization.dump(self.demo_results, f, indent=2)
         
         print(f"\n📄 Demo results saved: demo-results.json")
     
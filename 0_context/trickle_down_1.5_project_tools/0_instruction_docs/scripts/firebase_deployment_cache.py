@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""
+firebase_deployment_cache.py
+
+Persistent deployment cache for the Firebase orchestration system.
+Remembers the configuration fingerprint of every integration that deployed
+successfully so unchanged integrations can be skipped on the next run.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import firebase_serialization
+
+class DeploymentCache:
+    """Fingerprints of successful integration deployments, persisted as JSON."""
+
+    def __init__(self, cache_file: str = "deployment-cache.json"):
+        self.cache_file = cache_file
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @staticmethod
+    def fingerprint(environment: str, integration: str, integration_config: Dict[str, Any],
+                    environment_config: Dict[str, Any], handler_version: str,
+                    dependency_fingerprints: List[str]) -> str:
+        """Content hash of everything that determines an integration deployment.
+        
+        Hashed through stdlib json so the canonical form, and every stored fingerprint,
+        does not depend on which serialization backend is installed.
+        """
+        payload = json.dumps({
+            "environment": environment,
+            "integration": integration,
+            "integration_config": integration_config,
+            "environment_config": environment_config,
+            "handler_version": handler_version,
+            "dependencies": dependency_fingerprints
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self):
+        """Load cache entries from disk."""
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, 'r') as f:
+                self.entries = firebase_serialization.load(f)
+
+    def save(self):
+        """Write cache entries to disk atomically."""
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w') as f:
+            firebase_serialization.dump(self.entries, f, indent=2)
+        os.replace(temp_file, self.cache_file)
+
+    def is_current(self, fingerprint: str) -> bool:
+        """Whether a deployment with this fingerprint already succeeded."""
+        return fingerprint in self.entries
+
+    def record_success(self, environment: str, integration: str, fingerprint: str, task_id: Optional[str] = None):
+        """Record a successful deployment, replacing older fingerprints for the same integration."""
+        self.invalidate(environment, integration)
+        self.entries[fingerprint] = {
+            "environment": environment,
+            "integration": integration,
+            "task_id": task_id,
+            "completed_at": datetime.now().isoformat()
+        }
+
+    def invalidate(self, environment: Optional[str] = None, integration: Optional[str] = None):
+        """Forget successful deployments, optionally limited to an environment and/or integration."""
+        for fingerprint, entry in list(self.entries.items()):
+            if environment is not None and entry["environment"] != environment:
+                continue
+            if integration is not None and entry["integration"] != integration:
+                continue
+            del self.entries[fingerprint]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""
+firebase_duration_history.py
+
+Task duration history for the Firebase orchestration system.
+Records how long each integration deployment actually took, in seconds, per
+environment and pooled across environments, and turns the history into
+EWMA or percentile estimates for planning.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import firebase_serialization
+
+# Key of the samples pooled across every environment
+POOLED_ENVIRONMENT = "*"
+
+STATISTICS = ("ewma", "p50", "p90", "p95")
+
+class DurationHistory:
+    """Recent task durations per (environment, integration), persisted as JSON."""
+
+    def __init__(self, history_file: str = "duration-history.json", max_samples: int = 50,
+                 alpha: float = 0.3, min_samples: int = 3):
+        self.history_file = history_file
+        self.max_samples = max_samples
+        self.alpha = alpha  # weight of the newest sample in the EWMA
+        self.min_samples = min_samples  # samples needed before an estimate is trusted
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @staticmethod
+    def key(environment: str, integration: str) -> str:
+        return f"{environment}/{integration}"
+
+    def load(self):
+        """Load the history from disk."""
+        if os.path.exists(self.history_file):
+            with open(self.history_file, 'r') as f:
+                self.entries = firebase_serialization.load(f)
+
+    def save(self):
+        """Write the history to disk atomically."""
+        temp_file = f"{self.history_file}.tmp"
+        with open(temp_file, 'w') as f:
+            firebase_serialization.dump(self.entries, f, indent=2)
+        os.replace(temp_file, self.history_file)
+
+    def record(self, environment: str, integration: str, seconds: float):
+        """Record one successful run, for the environment and for the pooled history."""
+        for key in (self.key(environment, integration), self.key(POOLED_ENVIRONMENT, integration)):
+            entry = self.entries.setdefault(key, {"count": 0, "ewma": seconds, "samples": []})
+            entry["count"] += 1
+            entry["ewma"] = self.alpha * seconds + (1 - self.alpha) * entry["ewma"]
+            entry["samples"].append(seconds)
+            del entry["samples"][:-self.max_samples]
+
+    def _trusted_entry(self, environment: Optional[str], integration: str) -> Optional[Dict[str, Any]]:
+        """The environment's entry, else the pooled one, if it has enough samples."""
+        for env in (environment, POOLED_ENVIRONMENT):
+            entry = self.entries.get(self.key(env, integration)) if env is not None else None
+            if entry is not None and len(entry["samples"]) >= self.min_samples:
+                return entry
+        return None
+
+    def estimate(self, environment: Optional[str], integration: str, statistic: str = "ewma") -> Optional[float]:
+        """Estimated seconds for an integration deployment, or None without enough history."""
+        entry = self._trusted_entry(environment, integration)
+        if entry is None:
+            return None
+        if statistic == "ewma":
+            return entry["ewma"]
+        if statistic not in STATISTICS:
+            raise ValueError(f"Unknown duration statistic: {statistic}")
+        return percentile(entry["samples"], float(statistic[1:]))
+
+    def stats(self, environment: Optional[str], integration: str) -> Optional[Dict[str, Any]]:
+        """Every estimate for an integration deployment, and which history it came from."""
+        entry = self._trusted_entry(environment, integration)
+        if entry is None:
+            return None
+        samples = entry["samples"]
+        return {
+            "source": "environment" if entry is self.entries.get(self.key(environment, integration)) else "pooled",
+            "count": entry["count"],
+            "ewma_seconds": entry["ewma"],
+            **{f"{statistic}_seconds": percentile(samples, float(statistic[1:])) for statistic in STATISTICS[1:]}
+        }
+
+def percentile(samples: List[float], q: float) -> float:
+    """The q-th percentile of samples, interpolating linearly between ranks."""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
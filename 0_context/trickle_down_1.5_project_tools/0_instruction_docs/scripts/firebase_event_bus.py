@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+"""
+firebase_event_bus.py
+
+In-process publish/subscribe bus for the Firebase orchestration system.
+Task, integration, health and configuration changes are published as typed
+events; dashboards, report counters and external sinks subscribe with a
+bounded queue instead of polling and rescanning system state.
+
+Each subscription picks what happens when its queue is full:
+    drop_oldest - discard the oldest queued event (live views)
+    drop_newest - discard the event being published
+    block       - never drop; events beyond a full queue are held back and
+                  publishers wait in EventBus.backpressure() until the
+                  subscriber catches up. The orchestrator waits before and
+                  after every step that publishes (planning, each task run,
+                  each scheduling round, health checks, config reloads), so
+                  the held-back events are at most the few published by the
+                  steps already under way
+"""
+
+import asyncio
+import collections
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Type
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+class OrchestrationEvent:
+    """Base class of every event published on the bus."""
+
+@dataclass(frozen=True)
+class TaskQueued(OrchestrationEvent):
+    task_id: str
+    name: str
+    environment: str
+    integration: Optional[str]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class TaskStarted(OrchestrationEvent):
+    task_id: str
+    name: str
+    environment: str
+    integration: Optional[str]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class TaskRetried(OrchestrationEvent):
+    task_id: str
+    name: str
+    environment: str
+    integration: Optional[str]
+    retry_count: int
+    delay_seconds: float
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class TaskCompleted(OrchestrationEvent):
+    task_id: str
+    name: str
+    environment: str
+    integration: Optional[str]
+    duration_seconds: Optional[float]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class TaskFailed(OrchestrationEvent):
+    task_id: str
+    name: str
+    environment: str
+    integration: Optional[str]
+    error_message: Optional[str]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class TaskSkipped(OrchestrationEvent):
+    task_id: str
+    name: str
+    environment: str
+    integration: Optional[str]
+    reason: Optional[str]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class IntegrationStatusChanged(OrchestrationEvent):
+    integration: str
+    environment: str
+    type: str
+    previous: str
+    status: str
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class HealthChanged(OrchestrationEvent):
+    component: str
+    previous: Optional[str]
+    status: str
+    timestamp: datetime = field(default_factory=datetime.now)
+
+@dataclass(frozen=True)
+class ConfigChanged(OrchestrationEvent):
+    changes: Dict[str, Any]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+class Subscription:
+    """A bounded queue of the events one subscriber asked for."""
+
+    def __init__(self, bus: "EventBus", event_types: Tuple[Type[OrchestrationEvent], ...],
+                 maxsize: int, overflow: str):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.bus = bus
+        self.event_types = event_types
+        self.overflow = overflow
+        self.queue: asyncio.Queue = asyncio.Queue(max(1, maxsize))
+        self.dropped = 0
+        # Events held back from a full queue under the block policy
+        self._backlog: Deque[OrchestrationEvent] = collections.deque()
+        self._caught_up: Optional[asyncio.Event] = None
+
+    def offer(self, event: OrchestrationEvent):
+        """Queue an event without waiting, applying the overflow policy when full."""
+        if not self._backlog and not self.queue.full():
+            self.queue.put_nowait(event)
+        elif self.overflow == "drop_newest":
+            self.dropped += 1
+        elif self.overflow == "drop_oldest":
+            self.queue.get_nowait()
+            self.queue.put_nowait(event)
+            self.dropped += 1
+        else:
+            self._backlog.append(event)
+
+    @property
+    def backlog(self) -> int:
+        return len(self._backlog)
+
+    async def get(self) -> OrchestrationEvent:
+        """Wait for the next event."""
+        event = await self.queue.get()
+        while self._backlog and not self.queue.full():
+            self.queue.put_nowait(self._backlog.popleft())
+        if not self._backlog and self._caught_up is not None:
+            self._caught_up.set()
+        return event
+
+    async def wait_caught_up(self):
+        """Wait until no events are held back for this subscriber."""
+        while self._backlog:
+            if self._caught_up is None:
+                self._caught_up = asyncio.Event()
+            self._caught_up.clear()
+            await self._caught_up.wait()
+
+    def close(self):
+        """Stop receiving events."""
+        self.bus.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> OrchestrationEvent:
+        return await self.get()
+
+class EventBus:
+    """Fan-out of published events to every subscription interested in their type."""
+
+    def __init__(self):
+        self.subscriptions: List[Subscription] = []
+        self.published = 0
+
+    def subscribe(self, event_types: Sequence[Type[OrchestrationEvent]] = (OrchestrationEvent,),
+                  maxsize: int = 1000, overflow: str = "drop_oldest") -> Subscription:
+        """Subscribe to events of the given types (and their subclasses)."""
+        subscription = Subscription(self, tuple(event_types), maxsize, overflow)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+        # Held-back events will never be read, so stop publishers waiting on them
+        subscription._backlog.clear()
+        if subscription._caught_up is not None:
+            subscription._caught_up.set()
+
+    def has_subscribers(self, event_type: Type[OrchestrationEvent]) -> bool:
+        """Whether anyone would receive an event of this type; lets publishers skip building it."""
+        return any(issubclass(event_type, subscription.event_types) for subscription in self.subscriptions)
+
+    def publish(self, event: OrchestrationEvent):
+        """Deliver an event to every matching subscription without waiting."""
+        self.published += 1
+        for subscription in self.subscriptions:
+            if isinstance(event, subscription.event_types):
+                subscription.offer(event)
+
+    async def backpressure(self):
+        """Wait until every blocking subscriber has caught up with the events held back for it."""
+        for subscription in list(self.subscriptions):
+            await subscription.wait_caught_up()
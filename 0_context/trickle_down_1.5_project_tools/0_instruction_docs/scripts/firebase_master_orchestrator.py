@@ -9,20 +9,22 @@ This is the meta-level system that coordinates everything.
 """
 
 import asyncio
-import json
 import os
 import subprocess
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
-import yaml
 
 # Import our orchestration components
 from firebase_orchestration_system import FirebaseOrchestrationSystem, EnvironmentType, IntegrationType, TaskStatus
-from firebase_visual_orchestrator import FirebaseVisualOrchestrator
+from firebase_orchestration_context import OrchestrationContext
+from firebase_report_writer import write_json_file
+import firebase_serialization
+from firebase_serialization import register_type
 
+@register_type
 class OrchestrationMode(Enum):
     PLANNING = "planning"
     IMPLEMENTATION = "implementation"
@@ -30,6 +32,7 @@ class OrchestrationMode(Enum):
     MONITORING = "monitoring"
     OPTIMIZATION = "optimization"
 
+@register_type
 @dataclass
 class SystemGoal:
     """Represents a system goal or objective."""
@@ -43,6 +46,7 @@ class SystemGoal:
     deadline: Optional[datetime]
     status: str
 
+@register_type
 @dataclass
 class SystemConstraint:
     """Represents a system constraint."""
@@ -57,10 +61,16 @@ class SystemConstraint:
 class FirebaseMasterOrchestrator:
     """Master orchestration system for Firebase environments and integrations."""
     
-    def __init__(self, config_file: str = "master-orchestration-config.json"):
+    def __init__(self, config_file: str = "master-orchestration-config.json",
+                 context: Optional[OrchestrationContext] = None):
         self.config_file = config_file
-        self.orchestration_system = FirebaseOrchestrationSystem()
-        self.visual_orchestrator = FirebaseVisualOrchestrator(self.orchestration_system)
+        if context is None:
+            # Standalone use: own a context and be its master layer
+            context = OrchestrationContext(master_config_file=config_file)
+        context.attach_master(self)
+        self.context = context
+        self.orchestration_system = context.system
+        self.visual_orchestrator = context.visual
         
         self.goals: Dict[str, SystemGoal] = {}
         self.constraints: Dict[str, SystemConstraint] = {}
@@ -73,13 +83,14 @@ class FirebaseMasterOrchestrator:
         """Load master configuration."""
         if os.path.exists(self.config_file):
             with open(self.config_file, 'r') as f:
-                config = json.load(f)
+                config = firebase_serialization.load(f)
                 self.config = config
         else:
             self.config = self.get_default_master_configuration()
             self.save_configuration()
     
-    def get_default_master_configuration(self) -> Dict:
+    @staticmethod
+    def get_default_master_configuration() -> Dict:
         """Get default master configuration."""
         return {
             "master_system": {
@@ -184,7 +195,7 @@ class FirebaseMasterOrchestrator:
     def save_configuration(self):
         """Save master configuration."""
         with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2, default=str)
+            firebase_serialization.dump(self.config, f, indent=2)
     
     def initialize_system(self):
         """Initialize the master orchestration system."""
@@ -473,9 +484,24 @@ class FirebaseMasterOrchestrator:
         
         timeline["phases"] = phases
         
+        # Predicted deployment time per environment, from learned task durations where available
+        orchestration = self.orchestration_system
+        slots = orchestration.get_default_task_slots()
+        deployment_minutes = 0.0
+        for env_name, environment in orchestration.environments.items():
+            template = orchestration.get_plan_template(env_name, environment.integrations)
+            minutes = orchestration.predict_makespan(template.tasks, slots)
+            deployment_minutes += minutes
+            timeline["milestones"].append({
+                "name": f"{env_name} deployed",
+                "after_phase": "Applications",
+                "predicted_deployment_minutes": round(minutes, 1)
+            })
+        timeline["deployment_minutes"] = round(deployment_minutes, 1)
+        
         # Calculate total duration
         total_days = sum(phase["duration_days"] for phase in phases)
-        timeline["estimated_completion"] = datetime.now() + timedelta(days=total_days)
+        timeline["estimated_completion"] = datetime.now() + timedelta(days=total_days, minutes=deployment_minutes)
         
         return timeline
     
@@ -601,11 +627,13 @@ class FirebaseMasterOrchestrator:
         """Implement environment strategy."""
         print("🏗️ Implementing environments...")
         
+        # Environments are independent Firebase projects, so deploy them in parallel
+        deployments = {}
         for env in environment_strategy["required_environments"]:
             integrations = environment_strategy["environment_configurations"][env]["integrations"]
-            integration_types = [IntegrationType(i) for i in integrations]
-            
-            await self.orchestration_system.deploy_environment(env, integration_types)
+            deployments[env] = [IntegrationType(i) for i in integrations]
+        
+        await self.orchestration_system.deploy_environments(deployments)
     
     async def _implement_integrations(self, integration_strategy: Dict[str, Any]):
         """Implement integration strategy."""
@@ -644,8 +672,8 @@ class FirebaseMasterOrchestrator:
             "action_items": []
         }
         
-        # Check system health
-        management_report["system_health"] = await self.orchestration_system.health_check()
+        # Check system health, reusing the latest result while it is current
+        management_report["system_health"] = await self.orchestration_system.get_current_health()
         
         # Check goal progress
         management_report["goal_progress"] = await self._check_goal_progress()
@@ -768,8 +796,9 @@ class FirebaseMasterOrchestrator:
         # Create visual orchestrator dashboard
         dashboard_file = self.visual_orchestrator.visualize_dashboard()
         
-        # Generate orchestration report
-        orchestration_report = self.orchestration_system.generate_report()
+        # Orchestration report sections are streamed while the file is written
+        orchestration_report = self.orchestration_system.generate_report_stream()
+        orchestration_sections = dict(orchestration_report)
         
         # Create comprehensive report
         report = {
@@ -786,10 +815,10 @@ class FirebaseMasterOrchestrator:
                 "constraint_compliance": "compliant"
             },
             "system_architecture": {
-                "environments": orchestration_report["environments"],
-                "integrations": orchestration_report["integrations"],
-                "goals": {goal_id: asdict(goal) for goal_id, goal in self.goals.items()},
-                "constraints": {constraint_id: asdict(constraint) for constraint_id, constraint in self.constraints.items()}
+                "environments": orchestration_sections["environments"],
+                "integrations": orchestration_sections["integrations"],
+                "goals": dict(self.goals),
+                "constraints": dict(self.constraints)
             },
             "operational_metrics": orchestration_report,
             "visualizations": {
@@ -805,8 +834,8 @@ class FirebaseMasterOrchestrator:
         
         # Save report
         report_file = f"master-system-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        compact = self.orchestration_system.config["system"].get("report_compact", False)
+        write_json_file(report_file, report, indent=None if compact else 2)
         
         print(f"📄 Comprehensive system report saved: {report_file}")
         return report_file
@@ -828,7 +857,7 @@ async def main():
     
     # Save architecture plan
     with open("architecture-plan.json", "w") as f:
-        json.dump(architecture_plan, f, indent=2, default=str)
+        firebase_serialization.dump(architecture_plan, f, indent=2, typed=True)
     
     print("✅ Architecture plan saved: architecture-plan.json")
     
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""
+firebase_orchestration_context.py
+
+Shared orchestration context for the Firebase orchestration system.
+The master, visual and demo layers all work on one FirebaseOrchestrationSystem
+through a context, so configuration is loaded once and task state lives in a
+single place. Each layer is created lazily the first time it is asked for.
+"""
+
+from typing import Optional
+
+from firebase_orchestration_system import FirebaseOrchestrationSystem
+
+class OrchestrationContext:
+    """One orchestration core and the layers built on top of it."""
+
+    def __init__(self, config_file: str = "orchestration-config.json",
+                 master_config_file: str = "master-orchestration-config.json",
+                 system: Optional[FirebaseOrchestrationSystem] = None):
+        self.config_file = config_file
+        self.master_config_file = master_config_file
+        self._system = system
+        self._visual = None
+        self._master = None
+
+    @property
+    def system(self) -> FirebaseOrchestrationSystem:
+        """The shared orchestration system, loading its configuration on first use."""
+        if self._system is None:
+            self._system = FirebaseOrchestrationSystem(self.config_file)
+        return self._system
+
+    @property
+    def visual(self):
+        """The visual orchestrator for the shared system."""
+        if self._visual is None:
+            from firebase_visual_orchestrator import FirebaseVisualOrchestrator
+            self._visual = FirebaseVisualOrchestrator(self.system)
+        return self._visual
+
+    @property
+    def master(self):
+        """The master orchestrator for the shared system."""
+        if self._master is None:
+            from firebase_master_orchestrator import FirebaseMasterOrchestrator
+            # The master attaches itself while it is being created
+            FirebaseMasterOrchestrator(self.master_config_file, context=self)
+        return self._master
+
+    def attach_master(self, master):
+        """Make an existing master orchestrator the master layer of this context."""
+        if self._master is not None and self._master is not master:
+            raise ValueError("Orchestration context already has a master orchestrator")
+        self._master = master
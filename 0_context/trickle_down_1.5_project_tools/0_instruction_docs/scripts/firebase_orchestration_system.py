@@ -8,21 +8,45 @@ This is the foundational system that manages Firebase deployments.
 """
 
 import asyncio
+import collections
+import collections.abc
+import contextlib
+import dataclasses
+import hashlib
+import heapq
 import json
 import os
+import random
 import subprocess
+import sys
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from firebase_command_runner import (
+    AsyncCommandRunner, CommandResult, CommandTimeoutError, WorkerPoolCommandRunner, record_commands
+)
+from firebase_deployment_cache import DeploymentCache
+from firebase_duration_history import DurationHistory
+from firebase_event_bus import (
+    ConfigChanged, EventBus, HealthChanged, IntegrationStatusChanged, TaskCompleted, TaskFailed, TaskQueued,
+    TaskRetried, TaskSkipped, TaskStarted
+)
+from firebase_report_writer import StreamedObject, materialize, write_json_file_async
+import firebase_serialization
+from firebase_serialization import register_type
+from firebase_state_store import SQLiteStateStore
+
+@register_type
 class EnvironmentType(Enum):
     DEVELOPMENT = "development"
     STAGING = "staging"
     PRODUCTION = "production"
     TESTING = "testing"
 
+@register_type
 class IntegrationType(Enum):
     AUTHENTICATION = "authentication"
     DATABASE = "database"
@@ -35,6 +59,7 @@ class IntegrationType(Enum):
     BACKUP = "backup"
     SECURITY = "security"
 
+@register_type
 class TaskStatus(Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -42,50 +67,355 @@ class TaskStatus(Enum):
     FAILED = "failed"
     SKIPPED = "skipped"
 
-@dataclass
-class Environment:
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+    """Store an optional datetime as epoch seconds."""
+    return value.timestamp() if isinstance(value, datetime) else value
+
+def _from_epoch(value: Optional[float]) -> Optional[datetime]:
+    """Restore an optional datetime from epoch seconds."""
+    return datetime.fromtimestamp(value) if value is not None else None
+
+class _SlottedRecord:
+    """Base for memory-lean records: no per-instance __dict__, dataclass-like repr and equality.
+    
+    Timestamps are stored as epoch floats in underscore slots and exposed as datetime
+    properties; names repeated across many records are interned.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    
+    def __repr__(self) -> str:
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({values})"
+    
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self._fields)
+    
+    __hash__ = None
+
+@register_type
+class Environment(_SlottedRecord):
     """Represents a Firebase environment."""
-    name: str
-    type: EnvironmentType
-    project_id: str
-    region: str
-    created_at: datetime
-    status: str
-    integrations: List[IntegrationType]
-    dependencies: List[str]
-    configuration: Dict[str, Any]
+    __slots__ = ("name", "type", "project_id", "region", "_created_at", "status",
+                 "integrations", "dependencies", "configuration")
+    _fields = ("name", "type", "project_id", "region", "created_at", "status",
+               "integrations", "dependencies", "configuration")
+    
+    def __init__(self, name: str, type: EnvironmentType, project_id: str, region: str, created_at: datetime,
+                 status: str, integrations: Sequence[IntegrationType], dependencies: Sequence[str],
+                 configuration: Dict[str, Any]):
+        self.name = sys.intern(name)
+        self.type = type
+        self.project_id = project_id
+        self.region = sys.intern(region)
+        self.created_at = created_at
+        self.status = status
+        self.integrations: Tuple[IntegrationType, ...] = tuple(integrations)
+        self.dependencies: Tuple[str, ...] = tuple(dependencies)
+        self.configuration = configuration
+    
+    @property
+    def created_at(self) -> datetime:
+        return _from_epoch(self._created_at)
+    
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at = _to_epoch(value)
 
-@dataclass
-class Integration:
+@register_type
+class Integration(_SlottedRecord):
     """Represents a Firebase integration."""
-    name: str
-    type: IntegrationType
-    environment: str
-    status: TaskStatus
-    configuration: Dict[str, Any]
-    dependencies: List[str]
-    health_check_url: Optional[str]
-    last_updated: datetime
+    __slots__ = ("name", "type", "environment", "status", "configuration", "dependencies",
+                 "health_check_url", "_last_updated")
+    _fields = ("name", "type", "environment", "status", "configuration", "dependencies",
+               "health_check_url", "last_updated")
+    
+    def __init__(self, name: str, type: IntegrationType, environment: str, status: TaskStatus,
+                 configuration: Dict[str, Any], dependencies: Sequence[str], health_check_url: Optional[str],
+                 last_updated: datetime):
+        self.name = sys.intern(name)
+        self.type = type
+        self.environment = sys.intern(environment)
+        self.status = status
+        self.configuration = configuration
+        self.dependencies: Tuple[str, ...] = tuple(dependencies)
+        self.health_check_url = health_check_url
+        self.last_updated = last_updated
+    
+    @property
+    def last_updated(self) -> datetime:
+        return _from_epoch(self._last_updated)
+    
+    @last_updated.setter
+    def last_updated(self, value: datetime):
+        self._last_updated = _to_epoch(value)
 
-@dataclass
-class Task:
+@register_type
+class Task(_SlottedRecord):
     """Represents a task in the orchestration system."""
-    id: str
+    __slots__ = ("id", "name", "description", "environment", "integration", "status", "priority",
+                 "dependencies", "estimated_duration", "actual_duration", "_created_at", "_started_at",
+                 "_completed_at", "error_message", "retry_count", "max_retries")
+    _fields = ("id", "name", "description", "environment", "integration", "status", "priority",
+               "dependencies", "estimated_duration", "actual_duration", "created_at", "started_at",
+               "completed_at", "error_message", "retry_count", "max_retries")
+    
+    def __init__(self, id: str, name: str, description: str, environment: str,
+                 integration: Optional[IntegrationType], status: TaskStatus, priority: int,
+                 dependencies: Sequence[str], estimated_duration: float,  # minutes
+                 actual_duration: Optional[float],  # seconds
+                 created_at: datetime, started_at: Optional[datetime],
+                 completed_at: Optional[datetime], error_message: Optional[str], retry_count: int,
+                 max_retries: int):
+        self.id = id
+        # Name and description repeat for every deployment of an integration to an environment
+        self.name = sys.intern(name)
+        self.description = sys.intern(description)
+        self.environment = sys.intern(environment)
+        self.integration = integration
+        self.status = status
+        self.priority = priority
+        self.dependencies: Tuple[str, ...] = tuple(dependencies)
+        self.estimated_duration = estimated_duration
+        self.actual_duration = actual_duration
+        self.created_at = created_at
+        self.started_at = started_at
+        self.completed_at = completed_at
+        self.error_message = error_message
+        self.retry_count = retry_count
+        self.max_retries = max_retries
+    
+    @property
+    def created_at(self) -> datetime:
+        return _from_epoch(self._created_at)
+    
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at = _to_epoch(value)
+    
+    @property
+    def started_at(self) -> Optional[datetime]:
+        return _from_epoch(self._started_at)
+    
+    @started_at.setter
+    def started_at(self, value: Optional[datetime]):
+        self._started_at = _to_epoch(value)
+    
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        return _from_epoch(self._completed_at)
+    
+    @completed_at.setter
+    def completed_at(self, value: Optional[datetime]):
+        self._completed_at = _to_epoch(value)
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter between task retries."""
+    base_delay_seconds: float = 5.0
+    max_delay_seconds: float = 300.0
+    multiplier: float = 2.0
+    jitter: float = 0.5  # fraction of the delay that is randomized
+    
+    def get_delay(self, retry_count: int) -> float:
+        """Get the delay before the given retry (1 for the first retry)."""
+        delay = min(self.max_delay_seconds, self.base_delay_seconds * self.multiplier ** max(0, retry_count - 1))
+        return random.uniform(delay * (1 - self.jitter), delay)
+
+@dataclass(frozen=True)
+class TaskTemplate:
+    """The part of a planned task that is the same every time it is planned."""
+    integration: IntegrationType
     name: str
     description: str
-    environment: str
-    integration: Optional[IntegrationType]
-    status: TaskStatus
     priority: int
-    dependencies: List[str]
-    estimated_duration: int  # minutes
-    actual_duration: Optional[int]
-    created_at: datetime
-    started_at: Optional[datetime]
-    completed_at: Optional[datetime]
-    error_message: Optional[str]
-    retry_count: int
-    max_retries: int
+    dependencies: Tuple[str, ...]
+    estimated_duration: float  # minutes
+    
+    @property
+    def id(self) -> str:
+        """Templates are identified by integration, so they sort with sort_tasks_by_dependencies."""
+        return self.integration.value
+    
+    @property
+    def environment(self) -> None:
+        """Templates are shared by every environment, so they all resolve dependencies together."""
+        return None
+
+@dataclass(frozen=True)
+class PlanTemplate:
+    """Immutable deployment plan for an environment and integration set, in dependency order."""
+    environment: str
+    tasks: Tuple[TaskTemplate, ...]
+    
+    @property
+    def integrations(self) -> Tuple[IntegrationType, ...]:
+        return tuple(task.integration for task in self.tasks)
+    
+    @property
+    def estimated_duration(self) -> float:
+        return sum(task.estimated_duration for task in self.tasks)
+    
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Dependencies of each integration in the plan."""
+        return {task.integration.value: list(task.dependencies) for task in self.tasks}
+
+class DependencyCycleError(ValueError):
+    """Raised when task dependencies form a cycle."""
+    
+    def __init__(self, task_names: List[str]):
+        super().__init__(f"Dependency cycle detected; unresolved tasks: {', '.join(task_names)}")
+        self.task_names = task_names
+
+class TaskStatusCounters:
+    """Task counts per status, overall and per environment and integration, kept up to date on every transition."""
+    
+    def __init__(self):
+        self.by_status: collections.Counter = collections.Counter()
+        self.by_environment: Dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+        self.by_integration: Dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+    
+    def _counters(self, task: Task) -> List[collections.Counter]:
+        counters = [self.by_status, self.by_environment[task.environment]]
+        if task.integration is not None:
+            counters.append(self.by_integration[task.integration.value])
+        return counters
+    
+    def add(self, task: Task):
+        """Count a newly registered task."""
+        for counter in self._counters(task):
+            counter[task.status] += 1
+    
+    def move(self, task: Task, status: TaskStatus):
+        """Count a task's transition from its current status to a new one."""
+        if task.status == status:
+            return
+        for counter in self._counters(task):
+            counter[task.status] -= 1
+            counter[status] += 1
+    
+    def count(self, status: TaskStatus, environment: Optional[str] = None, integration: Optional[str] = None) -> int:
+        """Number of tasks in a status, optionally limited to one environment or integration."""
+        if environment is not None:
+            return self.by_environment.get(environment, collections.Counter())[status]
+        if integration is not None:
+            return self.by_integration.get(integration, collections.Counter())[status]
+        return self.by_status[status]
+    
+    def summary(self, counter: Optional[collections.Counter] = None) -> Dict[str, int]:
+        """Counts for every status, with the total."""
+        counter = self.by_status if counter is None else counter
+        summary = {status.value: counter[status] for status in TaskStatus}
+        summary["total"] = sum(summary.values())
+        return summary
+
+class IntegrationRegistry(collections.abc.MutableMapping):
+    """Integrations keyed by name, with secondary indexes by environment, type and status.
+    
+    Integration status must change through set_status() so the status index stays exact.
+    """
+    
+    def __init__(self):
+        self._integrations: Dict[str, Integration] = {}
+        # Insertion-ordered dicts used as ordered sets of integration names
+        self.by_environment: Dict[str, Dict[str, Integration]] = collections.defaultdict(dict)
+        self.by_type: Dict[IntegrationType, Dict[str, Integration]] = collections.defaultdict(dict)
+        self.by_status: Dict[TaskStatus, Dict[str, Integration]] = collections.defaultdict(dict)
+    
+    def __getitem__(self, name: str) -> Integration:
+        return self._integrations[name]
+    
+    def __setitem__(self, name: str, integration: Integration):
+        if name in self._integrations:
+            self._unindex(name, self._integrations[name])
+        self._integrations[name] = integration
+        self.by_environment[integration.environment][name] = integration
+        self.by_type[integration.type][name] = integration
+        self.by_status[integration.status][name] = integration
+    
+    def __delitem__(self, name: str):
+        self._unindex(name, self._integrations.pop(name))
+    
+    def __iter__(self):
+        return iter(self._integrations)
+    
+    def __len__(self) -> int:
+        return len(self._integrations)
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._integrations
+    
+    def keys(self):
+        return self._integrations.keys()
+    
+    def values(self):
+        return self._integrations.values()
+    
+    def items(self):
+        return self._integrations.items()
+    
+    def _unindex(self, name: str, integration: Integration):
+        for index, key in ((self.by_environment, integration.environment), (self.by_type, integration.type),
+                           (self.by_status, integration.status)):
+            index[key].pop(name, None)
+            if not index[key]:
+                del index[key]
+    
+    def set_status(self, integration: Integration, status: TaskStatus):
+        """Change an integration's status and move it between status indexes."""
+        if integration.status == status:
+            return
+        self.by_status[integration.status].pop(integration.name, None)
+        if not self.by_status[integration.status]:
+            del self.by_status[integration.status]
+        integration.status = status
+        self.by_status[status][integration.name] = integration
+    
+    def query(self, environment: Optional[str] = None, type: Optional[IntegrationType] = None,
+              status: Optional[TaskStatus] = None) -> List[Integration]:
+        """Integrations matching every given filter, scanning only the smallest matching index."""
+        candidates = [
+            index.get(key, {})
+            for index, key in ((self.by_environment, environment), (self.by_type, type), (self.by_status, status))
+            if key is not None
+        ]
+        if not candidates:
+            return list(self._integrations.values())
+        smallest = min(candidates, key=len)
+        return [
+            integration for integration in smallest.values()
+            if (environment is None or integration.environment == environment)
+            and (type is None or integration.type == type)
+            and (status is None or integration.status == status)
+        ]
+    
+    def status_counts(self) -> Dict[str, int]:
+        """Number of integrations in each status."""
+        return {status.value: len(self.by_status.get(status, {})) for status in TaskStatus}
+
+# Event published when a task enters each status
+TASK_STATUS_EVENTS = {
+    TaskStatus.IN_PROGRESS: TaskStarted,
+    TaskStatus.COMPLETED: TaskCompleted,
+    TaskStatus.FAILED: TaskFailed,
+    TaskStatus.SKIPPED: TaskSkipped
+}
+
+# Orderings for ready tasks: longest remaining estimated path first, or the fixed priority table
+SCHEDULING_POLICIES = ("critical_path", "priority")
+
+# Learned durations are rounded to this many significant digits, so small drifts in the history
+# leave estimates, and the plans cached for them, unchanged
+LEARNED_DURATION_SIGNIFICANT_DIGITS = 2
+
+# System settings read only when the system is created; changing them needs a restart
+RESTART_REQUIRED_SYSTEM_KEYS = {
+    "max_concurrent_tasks", "max_concurrent_commands", "command_timeout_seconds", "command_backend",
+    "cli_worker_command", "deployment_cache_file", "state_store_file", "duration_history_file",
+    "duration_history_min_samples"
+}
 
 class FirebaseOrchestrationSystem:
     """Main orchestration system for Firebase environments and integrations."""
@@ -93,35 +423,109 @@ class FirebaseOrchestrationSystem:
     def __init__(self, config_file: str = "orchestration-config.json"):
         self.config_file = config_file
         self.environments: Dict[str, Environment] = {}
-        self.integrations: Dict[str, Integration] = {}
+        self.integrations = IntegrationRegistry()
         self.tasks: Dict[str, Task] = {}
+        self.task_counters = TaskStatusCounters()
         self.task_queue: List[str] = []
         self.running_tasks: List[str] = []
         self.completed_tasks: List[str] = []
         self.failed_tasks: List[str] = []
+        self.skipped_tasks: List[str] = []
+        self.task_deployments: Dict[str, str] = {}
+        # Tasks that completed although a command failed (allow_manual_configuration)
+        self.manual_configuration_tasks: Set[str] = set()
+        self.task_id_counter = 0
+        self.events = EventBus()
+        self.config_mtime: Optional[int] = None
+        self.config_hash: Optional[str] = None
+        # (environment, integration types, config hash, duration estimates) -> plan template,
+        # least recently used first
+        self.plan_cache: collections.OrderedDict = collections.OrderedDict()
+        # (integration types, config hash, duration estimates) -> sorted task templates, least recently used first
+        self._plan_orders: collections.OrderedDict = collections.OrderedDict()
         
         self.load_configuration()
+        self.command_runner = self.create_command_runner()
+        self.probe_runner = self.create_probe_runner()
+        self.deployment_cache = self.create_deployment_cache()
+        self.duration_history = self.create_duration_history()
+        self.state_store = self.create_state_store()
+        self.retry_policy = RetryPolicy(**self.config["system"].get("retry_policy", {}))
+        self.health_probe_cache: Dict[Tuple[str, ...], Tuple[float, datetime, CommandResult]] = {}
+        self._health_probes_in_flight: Dict[Tuple[str, ...], asyncio.Task] = {}
+        self.latest_health: Optional[Dict[str, Any]] = None
+        self._latest_health_at: Optional[float] = None  # time.monotonic() of latest_health
+        self.health_listeners: List[Callable[[str, Optional[str], str], None]] = []
+        self._health_monitor: Optional[asyncio.Task] = None
+        self.config_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._config_watcher: Optional[asyncio.Task] = None
+        self._task_slots_by_loop: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
         self.initialize_system()
     
+    @property
+    def task_slots(self) -> asyncio.Semaphore:
+        """The global task limit of the running event loop.
+        
+        asyncio primitives bind to the loop that first waits on them, so the limit is created
+        per loop and one system can deploy across several asyncio.run() calls.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task_slots_by_loop is None or self._task_slots_by_loop[0] is not loop:
+            slots = asyncio.Semaphore(max(1, self.config["system"].get("max_concurrent_tasks", 5)))
+            self._task_slots_by_loop = (loop, slots)
+        return self._task_slots_by_loop[1]
+    
     def load_configuration(self):
         """Load system configuration."""
         if os.path.exists(self.config_file):
+            self.config_mtime = os.stat(self.config_file).st_mtime_ns
             with open(self.config_file, 'r') as f:
-                config = json.load(f)
+                config = firebase_serialization.load(f)
                 self.config = config
+            self.config_hash = self.hash_configuration(self.config)
         else:
             self.config = self.get_default_configuration()
             self.save_configuration()
     
-    def get_default_configuration(self) -> Dict:
+    @staticmethod
+    def get_default_configuration() -> Dict:
         """Get default system configuration."""
         return {
             "system": {
                 "name": "Firebase Orchestration System",
                 "version": "1.0.0",
                 "max_concurrent_tasks": 5,
+                "max_concurrent_tasks_per_project": 3,
+                "max_concurrent_commands": 5,
+                "command_timeout_seconds": 600,
+                "command_backend": "subprocess",
+                "cli_worker_command": None,
+                "cli": {
+                    "firebase": "firebase",
+                    "python": "python3",
+                    "scripts_dir": "scripts"
+                },
+                "deployment_cache_file": "deployment-cache.json",
+                "duration_history_file": "duration-history.json",
+                "duration_estimate": "ewma",
+                "duration_history_min_samples": 3,
+                "state_store_file": None,
                 "task_timeout_minutes": 30,
+                "task_timeout_overrides_minutes": {},
+                "retry_policy": {
+                    "base_delay_seconds": 5,
+                    "max_delay_seconds": 300,
+                    "multiplier": 2,
+                    "jitter": 0.5
+                },
                 "health_check_interval_minutes": 5,
+                "health_check_jitter_seconds": 30,
+                "health_check_cache_ttl_seconds": 60,
+                "health_probe_timeout_seconds": 30,
+                "config_watch_interval_seconds": 5,
+                "plan_cache_size": 256,
+                "scheduling_policy": "critical_path",
+                "report_compact": False,
                 "backup_interval_hours": 24
             },
             "environments": {
@@ -194,7 +598,76 @@ class FirebaseOrchestrationSystem:
     def save_configuration(self):
         """Save system configuration."""
         with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2, default=str)
+            firebase_serialization.dump(self.config, f, indent=2)
+        # Our own write is not a change for the config watcher
+        self.config_mtime = os.stat(self.config_file).st_mtime_ns
+        self.config_hash = self.hash_configuration(self.config)
+    
+    @staticmethod
+    def hash_configuration(config: Dict[str, Any]) -> str:
+        """Content hash of a configuration; hashed through stdlib json like deployment fingerprints."""
+        return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    
+    def create_command_runner(self) -> AsyncCommandRunner:
+        """Create the shared command runner from system configuration."""
+        system_config = self.config["system"]
+        max_concurrent = system_config.get("max_concurrent_commands", system_config.get("max_concurrent_tasks", 5))
+        default_timeout = system_config.get("command_timeout_seconds")
+        
+        backend = system_config.get("command_backend", "subprocess")
+        if backend == "worker_pool":
+            return WorkerPoolCommandRunner(
+                max_concurrent=max_concurrent,
+                default_timeout=default_timeout,
+                worker_command=system_config.get("cli_worker_command")
+            )
+        if backend != "subprocess":
+            raise ValueError(f"Unknown command backend: {backend}")
+        return AsyncCommandRunner(max_concurrent=max_concurrent, default_timeout=default_timeout)
+    
+    def create_probe_runner(self) -> AsyncCommandRunner:
+        """Create the runner for health probes.
+        
+        A separate instance of the configured backend, so probes get their own command slots
+        (and pooled workers) and the probe timeout is not spent queueing behind deployment
+        commands on the shared runner.
+        """
+        return self.create_command_runner()
+    
+    def firebase_command(self, *args: str) -> List[str]:
+        """Build a firebase CLI command line using the configured executable."""
+        return [self.config["system"].get("cli", {}).get("firebase", "firebase"), *args]
+    
+    def script_command(self, script: str, *args: str) -> List[str]:
+        """Build a helper script command line using the configured interpreter and scripts directory."""
+        cli_config = self.config["system"].get("cli", {})
+        return [
+            cli_config.get("python", "python3"),
+            os.path.join(cli_config.get("scripts_dir", "scripts"), script),
+            *args
+        ]
+    
+    def create_deployment_cache(self) -> Optional[DeploymentCache]:
+        """Create the deployment cache, unless it is disabled in system configuration."""
+        cache_file = self.config["system"].get("deployment_cache_file")
+        return DeploymentCache(cache_file) if cache_file else None
+    
+    def create_duration_history(self) -> Optional[DurationHistory]:
+        """Create the task duration history, unless it is disabled in system configuration."""
+        history_file = self.config["system"].get("duration_history_file")
+        if not history_file:
+            return None
+        return DurationHistory(history_file, min_samples=self.config["system"].get("duration_history_min_samples", 3))
+    
+    def create_state_store(self) -> Optional[SQLiteStateStore]:
+        """Create the durable state store when system.state_store_file names a database; it is opt-in."""
+        db_path = self.config["system"].get("state_store_file")
+        return SQLiteStateStore(db_path) if db_path else None
+    
+    def close(self):
+        """Flush and close durable state."""
+        if self.state_store is not None:
+            self.state_store.close()
     
     def initialize_system(self):
         """Initialize the orchestration system."""
@@ -202,58 +675,144 @@ class FirebaseOrchestrationSystem:
         
         # Initialize environments
         for env_name, env_config in self.config["environments"].items():
-            environment = Environment(
-                name=env_name,
-                type=EnvironmentType(env_name),
-                project_id=env_config["project_id"],
-                region=env_config["region"],
-                created_at=datetime.now(),
-                status="initializing",
-                integrations=[IntegrationType(i) for i in env_config["integrations"]],
-                dependencies=[],
-                configuration=env_config
-            )
-            self.environments[env_name] = environment
+            self.environments[env_name] = self._build_environment(env_name, env_config)
         
         # Initialize integrations
         for integration_name, integration_config in self.config["integrations"].items():
-            for env_name in self.environments:
-                if IntegrationType(integration_name) in self.environments[env_name].integrations:
-                    integration = Integration(
-                        name=f"{integration_name}_{env_name}",
-                        type=IntegrationType(integration_name),
-                        environment=env_name,
-                        status=TaskStatus.PENDING,
-                        configuration=integration_config,
-                        dependencies=[],
-                        health_check_url=None,
-                        last_updated=datetime.now()
-                    )
-                    self.integrations[f"{integration_name}_{env_name}"] = integration
+            integration_type = IntegrationType(integration_name)
+            for env_name, environment in self.environments.items():
+                if integration_type in environment.integrations:
+                    self._add_integration(integration_type, integration_config, env_name)
+        
+        # Restore integration status recorded by a previous run
+        self._restore_integration_statuses()
         
         print("✅ System initialized successfully")
     
+    def _build_environment(self, env_name: str, env_config: Dict[str, Any]) -> Environment:
+        return Environment(
+            name=env_name,
+            type=EnvironmentType(env_config.get("type", env_name)),
+            project_id=env_config["project_id"],
+            region=env_config["region"],
+            created_at=datetime.now(),
+            status="initializing",
+            integrations=[IntegrationType(i) for i in env_config["integrations"]],
+            dependencies=[],
+            configuration=env_config
+        )
+    
+    def _add_integration(self, integration_type: IntegrationType, integration_config: Dict[str, Any],
+                         env_name: str) -> Integration:
+        integration = Integration(
+            name=f"{integration_type.value}_{env_name}",
+            type=integration_type,
+            environment=env_name,
+            status=TaskStatus.PENDING,
+            configuration=integration_config,
+            dependencies=[],
+            health_check_url=None,
+            last_updated=datetime.now()
+        )
+        self.integrations[integration.name] = integration
+        return integration
+    
+    def _restore_integration_statuses(self, names: Optional[Set[str]] = None):
+        """Apply integration statuses recorded by a previous run, optionally only for some integrations."""
+        if self.state_store is None:
+            return
+        for integration_name, status in self.state_store.load_integration_statuses().items():
+            if integration_name in self.integrations and (names is None or integration_name in names):
+                self.integrations.set_status(self.integrations[integration_name], TaskStatus(status))
+    
     async def plan_deployment(self, environment: str, integration_types: List[IntegrationType]) -> List[Task]:
         """Plan deployment tasks for an environment."""
         print(f"📋 Planning deployment for {environment} environment...")
         
-        tasks = []
-        task_id_counter = 1
+        # Registering tasks publishes TaskQueued; blocking subscribers are waited for on both sides
+        await self.events.backpressure()
+        tasks = self.instantiate_plan(self.get_plan_template(environment, integration_types))
+        await self.events.backpressure()
+        
+        print(f"✅ Planned {len(tasks)} tasks for {environment}")
+        return tasks
+    
+    def get_plan_template(self, environment: str, integration_types: Sequence[IntegrationType]) -> PlanTemplate:
+        """The dependency-sorted plan for an environment and integration set, built once per configuration."""
+        integration_set = frozenset(integration_types)
+        # Learned durations change the plan, so the (rounded) estimates are part of the key; samples
+        # that leave every estimate where it was keep the cached plans valid
+        durations = {integration_type: self.get_estimated_duration(integration_type, environment)
+                     for integration_type in integration_set}
+        estimates = tuple(sorted((t.value, d) for t, d in durations.items()))
+        key: Tuple[str, FrozenSet[IntegrationType], Optional[str], Tuple] = (
+            environment, integration_set, self.config_hash, estimates
+        )
+        template = self.plan_cache.get(key)
+        if template is not None:
+            self.plan_cache.move_to_end(key)
+            return template
+        
+        # The sorted order depends on the environment only through its durations, so environments
+        # with the same estimates share it
+        cache_size = self.config["system"].get("plan_cache_size", 256)
+        order_key = (integration_set, self.config_hash, estimates)
+        order = self._plan_orders.get(order_key)
+        if order is not None:
+            self._plan_orders.move_to_end(order_key)
+        else:
+            # Canonical input order, so the same set always sorts the same way
+            task_templates = [
+                TaskTemplate(
+                    integration=integration_type,
+                    name=integration_type.value,
+                    description=integration_type.value,
+                    priority=self.get_integration_priority(integration_type),
+                    dependencies=tuple(self.get_integration_dependencies(integration_type)),
+                    estimated_duration=durations[integration_type]
+                )
+                for integration_type in sorted(integration_set,
+                                               key=lambda t: (self.get_integration_priority(t), t.value))
+            ]
+            order = self._plan_orders[order_key] = tuple(self.sort_tasks_by_dependencies(task_templates))
+            if len(self._plan_orders) > cache_size:
+                self._plan_orders.popitem(last=False)
+        
+        template = PlanTemplate(
+            environment=environment,
+            tasks=tuple(
+                dataclasses.replace(
+                    task_template,
+                    name=f"Deploy {task_template.integration.value} to {environment}",
+                    description=f"Deploy and configure {task_template.integration.value} integration for {environment} environment"
+                )
+                for task_template in order
+            )
+        )
         
-        # Create tasks for each integration
-        for integration_type in integration_types:
+        self.plan_cache[key] = template
+        if len(self.plan_cache) > cache_size:
+            self.plan_cache.popitem(last=False)
+        return template
+    
+    def instantiate_plan(self, template: PlanTemplate) -> List[Task]:
+        """Create and register fresh tasks for a plan template; ids stay unique across plans."""
+        tasks = []
+        created_at = datetime.now()
+        for task_template in template.tasks:
+            self.task_id_counter += 1
             task = Task(
-                id=f"task_{task_id_counter:04d}",
-                name=f"Deploy {integration_type.value} to {environment}",
-                description=f"Deploy and configure {integration_type.value} integration for {environment} environment",
-                environment=environment,
-                integration=integration_type,
+                id=f"task_{self.task_id_counter:04d}",
+                name=task_template.name,
+                description=task_template.description,
+                environment=template.environment,
+                integration=task_template.integration,
                 status=TaskStatus.PENDING,
-                priority=self.get_integration_priority(integration_type),
-                dependencies=self.get_integration_dependencies(integration_type),
-                estimated_duration=self.get_estimated_duration(integration_type),
+                priority=task_template.priority,
+                dependencies=task_template.dependencies,
+                estimated_duration=task_template.estimated_duration,
                 actual_duration=None,
-                created_at=datetime.now(),
+                created_at=created_at,
                 started_at=None,
                 completed_at=None,
                 error_message=None,
@@ -261,13 +820,7 @@ class FirebaseOrchestrationSystem:
                 max_retries=3
             )
             tasks.append(task)
-            self.tasks[task.id] = task
-            task_id_counter += 1
-        
-        # Sort tasks by priority and dependencies
-        tasks = self.sort_tasks_by_dependencies(tasks)
-        
-        print(f"✅ Planned {len(tasks)} tasks for {environment}")
+            self.register_task(task)
         return tasks
     
     def get_integration_priority(self, integration_type: IntegrationType) -> int:
@@ -302,8 +855,23 @@ class FirebaseOrchestrationSystem:
         }
         return dependency_map.get(integration_type, [])
     
-    def get_estimated_duration(self, integration_type: IntegrationType) -> int:
-        """Get estimated duration for integration type."""
+    def get_estimated_duration(self, integration_type: IntegrationType, environment: Optional[str] = None) -> float:
+        """Get estimated duration in minutes for integration type.
+        
+        Learned from recorded durations when there is enough history, for the environment
+        or else pooled across environments, and taken from the static table otherwise.
+        Learned estimates are rounded to LEARNED_DURATION_SIGNIFICANT_DIGITS.
+        """
+        if self.duration_history is not None:
+            seconds = self.duration_history.estimate(
+                environment, integration_type.value, self.config["system"].get("duration_estimate", "ewma")
+            )
+            if seconds is not None:
+                return float(f"{seconds / 60:.{LEARNED_DURATION_SIGNIFICANT_DIGITS}g}")
+        return self.get_static_estimated_duration(integration_type)
+    
+    def get_static_estimated_duration(self, integration_type: IntegrationType) -> int:
+        """Get the fallback duration in minutes for integration type."""
         duration_map = {
             IntegrationType.AUTHENTICATION: 5,
             IntegrationType.DATABASE: 10,
@@ -318,63 +886,308 @@ class FirebaseOrchestrationSystem:
         }
         return duration_map.get(integration_type, 10)
     
-    def sort_tasks_by_dependencies(self, tasks: List[Task]) -> List[Task]:
-        """Sort tasks by dependencies and priority."""
-        # Simple topological sort based on dependencies
+    def get_handler_version(self, integration_type: IntegrationType) -> str:
+        """Get handler version for integration type; bump it when a setup_* handler changes."""
+        version_map = {
+            IntegrationType.AUTHENTICATION: "1",
+            IntegrationType.DATABASE: "1",
+            IntegrationType.STORAGE: "1",
+            IntegrationType.FUNCTIONS: "1",
+            IntegrationType.HOSTING: "1",
+            IntegrationType.MONITORING: "1",
+            IntegrationType.BACKUP: "1",
+            IntegrationType.SECURITY: "1",
+            IntegrationType.ANALYTICS: "1",
+            IntegrationType.CI_CD: "1"
+        }
+        return version_map.get(integration_type, "1")
+    
+    def get_deployment_fingerprint(self, environment: str, integration_type: IntegrationType,
+                                   _memo: Optional[Dict[IntegrationType, str]] = None) -> str:
+        """Fingerprint an integration deployment, including the fingerprints of its dependencies."""
+        memo = {} if _memo is None else _memo
+        if integration_type not in memo:
+            # The integration list is excluded so enabling another integration changes nothing else
+            environment_config = {
+                key: value for key, value in self.config["environments"][environment].items()
+                if key != "integrations"
+            }
+            dependency_fingerprints = [
+                self.get_deployment_fingerprint(environment, IntegrationType(dependency), memo)
+                for dependency in self.get_integration_dependencies(integration_type)
+            ]
+            memo[integration_type] = DeploymentCache.fingerprint(
+                environment,
+                integration_type.value,
+                self.config["integrations"].get(integration_type.value, {}),
+                environment_config,
+                self.get_handler_version(integration_type),
+                dependency_fingerprints
+            )
+        return memo[integration_type]
+    
+    def build_dependency_graph(self, tasks: List[Task]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """Map each task id to the task ids it depends on and the task ids depending on it."""
+        # Dependencies name integration types in the same environment, so index tasks by both;
+        # fleet-wide task lists then keep each environment's dependencies separate
+        tasks_by_key: Dict[Tuple[Optional[str], str], Task] = {}
+        for task in tasks:
+            tasks_by_key[(task.environment, task.integration.value if task.integration else task.name)] = task
+        
+        depends_on: Dict[str, List[str]] = {}
+        dependents: Dict[str, List[str]] = {task.id: [] for task in tasks}
+        for task in tasks:
+            depends_on[task.id] = []
+            for dependency in task.dependencies:
+                dependency_task = tasks_by_key.get((task.environment, dependency))
+                # Dependencies outside this set of tasks are treated as already satisfied
+                if dependency_task is not None and dependency_task is not task:
+                    depends_on[task.id].append(dependency_task.id)
+                    dependents[dependency_task.id].append(task.id)
+        
+        return depends_on, dependents
+    
+    def compute_bottom_levels(self, tasks: Sequence[Task]) -> Dict[str, float]:
+        """Longest estimated duration from the start of each task to the end of the graph, itself included."""
+        depends_on, dependents = self.build_dependency_graph(tasks)
+        tasks_by_id = {task.id: task for task in tasks}
+        
+        # Kahn's algorithm for a topological order, then accumulate from the sinks back
+        unmet = {task_id: len(dependency_ids) for task_id, dependency_ids in depends_on.items()}
+        order = [task.id for task in tasks if not unmet[task.id]]
+        for task_id in order:
+            for dependent_id in dependents[task_id]:
+                unmet[dependent_id] -= 1
+                if not unmet[dependent_id]:
+                    order.append(dependent_id)
+        if len(order) < len(tasks):
+            raise DependencyCycleError([task.name for task in tasks if unmet[task.id]])
+        
+        bottom_levels: Dict[str, float] = {}
+        for task_id in reversed(order):
+            bottom_levels[task_id] = tasks_by_id[task_id].estimated_duration + max(
+                (bottom_levels[dependent_id] for dependent_id in dependents[task_id]), default=0
+            )
+        return bottom_levels
+    
+    def get_scheduling_policy(self, policy: Optional[str] = None) -> str:
+        """The given scheduling policy, or the configured one."""
+        policy = policy or self.config["system"].get("scheduling_policy", "critical_path")
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+        return policy
+    
+    def get_scheduling_keys(self, tasks: Sequence[Task], policy: Optional[str] = None) -> Dict[str, Tuple]:
+        """Sort key per task id for ordering ready tasks; lower keys start first."""
+        if self.get_scheduling_policy(policy) == "critical_path":
+            bottom_levels = self.compute_bottom_levels(tasks)
+            return {task.id: (-bottom_levels[task.id], task.priority) for task in tasks}
+        return {task.id: (task.priority,) for task in tasks}
+    
+    def sort_tasks_by_dependencies(self, tasks: List[Task], policy: Optional[str] = None) -> List[Task]:
+        """Sort tasks by dependencies, ordering ready tasks by the scheduling policy."""
+        depends_on, dependents = self.build_dependency_graph(tasks)
+        tasks_by_id = {task.id: task for task in tasks}
+        positions = {task.id: position for position, task in enumerate(tasks)}
+        unmet = {task_id: len(dependency_ids) for task_id, dependency_ids in depends_on.items()}
+        keys = self.get_scheduling_keys(tasks, policy)
+        
+        # Kahn's algorithm; among ready tasks, lowest scheduling key first
+        ready = [(keys[task.id], positions[task.id], task.id) for task in tasks if not unmet[task.id]]
+        heapq.heapify(ready)
+        
         sorted_tasks = []
-        remaining_tasks = tasks.copy()
-        
-        while remaining_tasks:
-            # Find tasks with no unmet dependencies
-            ready_tasks = []
-            for task in remaining_tasks:
-                if not task.dependencies or all(
-                    dep in [t.name for t in sorted_tasks] for dep in task.dependencies
-                ):
-                    ready_tasks.append(task)
-            
-            if not ready_tasks:
-                # Circular dependency or error
-                break
-            
-            # Sort by priority
-            ready_tasks.sort(key=lambda t: t.priority)
-            sorted_tasks.extend(ready_tasks)
-            
-            # Remove processed tasks
-            for task in ready_tasks:
-                remaining_tasks.remove(task)
+        while ready:
+            _, _, task_id = heapq.heappop(ready)
+            sorted_tasks.append(tasks_by_id[task_id])
+            for dependent_id in dependents[task_id]:
+                unmet[dependent_id] -= 1
+                if not unmet[dependent_id]:
+                    heapq.heappush(ready, (keys[dependent_id], positions[dependent_id], dependent_id))
+        
+        if len(sorted_tasks) < len(tasks):
+            raise DependencyCycleError([task.name for task in tasks if unmet[task.id]])
         
         return sorted_tasks
     
+    def predict_makespan(self, tasks: Sequence[Task], slots: int, policy: Optional[str] = None) -> float:
+        """Simulated minutes to run tasks on slots parallel workers, using estimated durations.
+        
+        Whenever a slot is free, the ready task with the lowest scheduling key starts.
+        """
+        depends_on, dependents = self.build_dependency_graph(tasks)
+        tasks_by_id = {task.id: task for task in tasks}
+        positions = {task.id: position for position, task in enumerate(tasks)}
+        unmet = {task_id: len(dependency_ids) for task_id, dependency_ids in depends_on.items()}
+        keys = self.get_scheduling_keys(tasks, policy)
+        
+        ready = [(keys[task.id], positions[task.id], task.id) for task in tasks if not unmet[task.id]]
+        heapq.heapify(ready)
+        running: List[Tuple[float, str]] = []
+        now = 0.0
+        while ready or running:
+            while ready and len(running) < slots:
+                _, _, task_id = heapq.heappop(ready)
+                heapq.heappush(running, (now + tasks_by_id[task_id].estimated_duration, task_id))
+            now, task_id = heapq.heappop(running)
+            for dependent_id in dependents[task_id]:
+                unmet[dependent_id] -= 1
+                if not unmet[dependent_id]:
+                    heapq.heappush(ready, (keys[dependent_id], positions[dependent_id], dependent_id))
+        return now
+    
+    def get_default_task_slots(self) -> int:
+        """Parallel tasks one environment can run: the global limit, capped by the per-project limit."""
+        system_config = self.config["system"]
+        slots = system_config.get("max_concurrent_tasks", 5)
+        per_project = system_config.get("max_concurrent_tasks_per_project")
+        return max(1, min(slots, per_project) if per_project else slots)
+    
+    def compare_scheduling_policies(self, tasks: Sequence[Task], slots: Optional[int] = None) -> Dict[str, Any]:
+        """Predicted makespan in minutes under each scheduling policy, with the theoretical lower bound."""
+        if slots is None:
+            slots = self.get_default_task_slots()
+        makespans = {policy: self.predict_makespan(tasks, slots, policy) for policy in SCHEDULING_POLICIES}
+        critical_path = max(self.compute_bottom_levels(tasks).values(), default=0)
+        return {
+            "slots": slots,
+            "policy": self.get_scheduling_policy(),
+            "predicted_minutes": makespans,
+            "critical_path_minutes": critical_path,
+            "lower_bound_minutes": max(critical_path, sum(task.estimated_duration for task in tasks) / slots),
+            "saved_minutes": makespans["priority"] - makespans["critical_path"]
+        }
+    
     async def execute_task(self, task: Task) -> bool:
         """Execute a single task."""
         print(f"🔄 Executing task: {task.name}")
         
-        task.status = TaskStatus.IN_PROGRESS
         task.started_at = datetime.now()
+        self.set_task_status(task, TaskStatus.IN_PROGRESS)
+        timeout = self.get_task_timeout(task)
         
-        try:
-            # Execute based on integration type
-            success = await self.execute_integration_task(task)
-            
-            if success:
-                task.status = TaskStatus.COMPLETED
-                task.completed_at = datetime.now()
-                task.actual_duration = int((task.completed_at - task.started_at).total_seconds() / 60)
-                print(f"✅ Task completed: {task.name}")
-                return True
-            else:
-                task.status = TaskStatus.FAILED
-                task.error_message = "Task execution failed"
-                print(f"❌ Task failed: {task.name}")
-                return False
+        with record_commands() as commands:
+            try:
+                # Execute based on integration type; cancelling it kills any running command
+                success = await asyncio.wait_for(self.execute_integration_task(task), timeout=timeout)
                 
-        except Exception as e:
-            task.status = TaskStatus.FAILED
-            task.error_message = str(e)
-            print(f"❌ Task error: {task.name} - {e}")
+                if success:
+                    if all(result.ok for result in commands):
+                        self.manual_configuration_tasks.discard(task.id)
+                    else:
+                        self.manual_configuration_tasks.add(task.id)
+                    task.completed_at = datetime.now()
+                    task.actual_duration = round((task.completed_at - task.started_at).total_seconds(), 3)
+                    if self.duration_history is not None and task.integration:
+                        self.duration_history.record(task.environment, task.integration.value, task.actual_duration)
+                    self.set_task_status(task, TaskStatus.COMPLETED)
+                    print(f"✅ Task completed: {task.name}")
+                    return True
+                else:
+                    task.error_message = "Task execution failed" + self._format_command_output(commands)
+                    self.set_task_status(task, TaskStatus.FAILED)
+                    print(f"❌ Task failed: {task.name}")
+                    return False
+                    
+            except asyncio.TimeoutError:
+                task.error_message = f"Task timed out after {timeout:g}s" + self._format_command_output(commands)
+                self.set_task_status(task, TaskStatus.FAILED)
+                print(f"⏱️ Task timed out: {task.name}")
+                return False
+            
+            except Exception as e:
+                task.error_message = str(e) + self._format_command_output(commands)
+                self.set_task_status(task, TaskStatus.FAILED)
+                print(f"❌ Task error: {task.name} - {e}")
+                return False
+    
+    def get_task_timeout(self, task: Task) -> Optional[float]:
+        """Get the deadline for a task in seconds, or None for no deadline."""
+        system_config = self.config["system"]
+        minutes = system_config.get("task_timeout_minutes")
+        if task.integration is not None:
+            minutes = system_config.get("task_timeout_overrides_minutes", {}).get(task.integration.value, minutes)
+        return minutes * 60 if minutes else None
+    
+    def _format_command_output(self, commands: List[CommandResult], max_chars: int = 2000) -> str:
+        """Describe the last command a task ran, including its (partial) output."""
+        if not commands:
+            return ""
+        result = commands[-1]
+        status = "killed" if result.timed_out else f"exit code {result.exit_code}"
+        output = "\n".join(part for part in (result.stdout_tail.strip(), result.stderr_tail.strip()) if part)
+        return f"\n--- {' '.join(result.args)} ({status}) ---\n{output[-max_chars:]}"
+    
+    def register_task(self, task: Task):
+        """Add a task to the system and its status counters."""
+        self.tasks[task.id] = task
+        self.task_counters.add(task)
+        if self.events.has_subscribers(TaskQueued):
+            self.events.publish(TaskQueued(task.id, task.name, task.environment, self._event_integration(task)))
+    
+    @staticmethod
+    def _event_integration(task: Task) -> Optional[str]:
+        return task.integration.value if task.integration else None
+    
+    def set_task_status(self, task: Task, status: TaskStatus, update_integration: bool = True):
+        """Apply a task state change and propagate it to the counters, the integration and the state store.
+        
+        Task status must only change through here so the counters stay exact. With
+        update_integration=False the integration keeps its status, e.g. when an unchanged
+        deployment is skipped and the integration stays deployed.
+        """
+        self.task_counters.move(task, status)
+        task.status = status
+        
+        integration = self.get_task_integration(task) if update_integration else None
+        if integration is not None:
+            previous = integration.status
+            self.integrations.set_status(integration, status)
+            integration.last_updated = datetime.now()
+            if previous != status and self.events.has_subscribers(IntegrationStatusChanged):
+                self.events.publish(IntegrationStatusChanged(
+                    integration.name, integration.environment, integration.type.value, previous.value, status.value
+                ))
+        
+        self._publish_task_event(task)
+        
+        if self.state_store is not None:
+            deployment_id = self.task_deployments.get(task.id)
+            if deployment_id is not None:
+                self.state_store.record_task(deployment_id, task)
+            if integration is not None:
+                self.state_store.record_integration(integration)
+    
+    def get_task_integration(self, task: Task) -> Optional[Integration]:
+        """The registered integration a task deploys, if any."""
+        if task.integration is None:
+            return None
+        return self.integrations.get(f"{task.integration.value}_{task.environment}")
+    
+    def is_deployment_current(self, task: Task, fingerprint: str) -> bool:
+        """Whether a task can be skipped because its last deployment succeeded with this fingerprint.
+        
+        An integration known to be broken in this process (failed, interrupted or skipped) is
+        deployed again even when the cache still holds its fingerprint; PENDING only means this
+        process has not deployed it yet, so the cache decides.
+        """
+        if self.deployment_cache is None or not self.deployment_cache.is_current(fingerprint):
             return False
+        integration = self.get_task_integration(task)
+        return integration is None or integration.status in (TaskStatus.COMPLETED, TaskStatus.PENDING)
+    
+    def _publish_task_event(self, task: Task):
+        """Publish the event for the status a task just entered; PENDING is covered by queued and retried."""
+        event_type = TASK_STATUS_EVENTS.get(task.status)
+        if event_type is None or not self.events.has_subscribers(event_type):
+            return
+        details = {
+            TaskStarted: (),
+            TaskCompleted: (task.actual_duration,),
+            TaskFailed: (task.error_message,),
+            TaskSkipped: (task.error_message,)
+        }[event_type]
+        self.events.publish(event_type(task.id, task.name, task.environment, self._event_integration(task), *details))
     
     async def execute_integration_task(self, task: Task) -> bool:
         """Execute integration-specific task."""
@@ -404,6 +1217,20 @@ class FirebaseOrchestrationSystem:
         else:
             return False
     
+    def handle_setup_failure(self, integration_type: IntegrationType, environment: str,
+                             error: subprocess.CalledProcessError) -> bool:
+        """Decide the outcome of a setup handler whose command failed.
+        
+        A failed command fails the task, so it is retried and its dependents are skipped,
+        unless the integration sets allow_manual_configuration to accept finishing it by hand.
+        """
+        integration = integration_type.value
+        if self.config["integrations"].get(integration, {}).get("allow_manual_configuration", False):
+            print(f"⚠️ {integration} setup may need manual configuration for {environment}: {error}")
+            return True
+        print(f"❌ {integration} setup failed for {environment}: {error}")
+        return False
+    
     async def setup_authentication(self, environment: str) -> bool:
         """Setup Firebase Authentication."""
         print(f"🔐 Setting up authentication for {environment}")
@@ -413,18 +1240,17 @@ class FirebaseOrchestrationSystem:
             
             # Use our existing domain configuration script
             domains = self.config["integrations"]["authentication"]["authorized_domains"]
-            result = subprocess.run([
-                "python3", "scripts/configure-auth-domains.py",
+            await self.command_runner.run(self.script_command(
+                "configure-auth-domains.py",
                 "--projects", project_id,
                 "--domains", *domains
-            ], check=True, capture_output=True)
+            ), check=True)
             
             print(f"✅ Authentication setup complete for {environment}")
             return True
             
         except subprocess.CalledProcessError as e:
-            print(f"⚠️ Authentication setup may need manual configuration for {environment}: {e}")
-            return True  # Don't fail the entire process
+            return self.handle_setup_failure(IntegrationType.AUTHENTICATION, environment, e)
     
     async def setup_database(self, environment: str) -> bool:
         """Setup Firebase Database."""
@@ -434,16 +1260,15 @@ class FirebaseOrchestrationSystem:
             project_id = self.environments[environment].project_id
             
             # Initialize Firestore
-            subprocess.run([
-                "firebase", "firestore:indexes", "--project", project_id
-            ], check=True, capture_output=True)
+            await self.command_runner.run(self.firebase_command(
+                "firestore:indexes", "--project", project_id
+            ), check=True)
             
             print(f"✅ Database setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Database setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.DATABASE, environment, e)
     
     async def setup_storage(self, environment: str) -> bool:
         """Setup Firebase Storage."""
@@ -453,16 +1278,15 @@ class FirebaseOrchestrationSystem:
             project_id = self.environments[environment].project_id
             
             # Initialize storage
-            subprocess.run([
-                "firebase", "storage:rules", "--project", project_id
-            ], check=True, capture_output=True)
+            await self.command_runner.run(self.firebase_command(
+                "storage:rules", "--project", project_id
+            ), check=True)
             
             print(f"✅ Storage setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Storage setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.STORAGE, environment, e)
     
     async def setup_functions(self, environment: str) -> bool:
         """Setup Firebase Functions."""
@@ -472,16 +1296,15 @@ class FirebaseOrchestrationSystem:
             project_id = self.environments[environment].project_id
             
             # Initialize functions
-            subprocess.run([
-                "firebase", "functions:config:get", "--project", project_id
-            ], check=True, capture_output=True)
+            await self.command_runner.run(self.firebase_command(
+                "functions:config:get", "--project", project_id
+            ), check=True)
             
             print(f"✅ Functions setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Functions setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.FUNCTIONS, environment, e)
     
     async def setup_hosting(self, environment: str) -> bool:
         """Setup Firebase Hosting."""
@@ -491,16 +1314,15 @@ class FirebaseOrchestrationSystem:
             project_id = self.environments[environment].project_id
             
             # Initialize hosting
-            subprocess.run([
-                "firebase", "hosting:channel:list", "--project", project_id
-            ], check=True, capture_output=True)
+            await self.command_runner.run(self.firebase_command(
+                "hosting:channel:list", "--project", project_id
+            ), check=True)
             
             print(f"✅ Hosting setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Hosting setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.HOSTING, environment, e)
     
     async def setup_monitoring(self, environment: str) -> bool:
         """Setup Firebase Monitoring."""
@@ -508,16 +1330,15 @@ class FirebaseOrchestrationSystem:
         
         try:
             # Use our existing monitoring setup
-            subprocess.run([
-                "python3", "scripts/firebase-setup-implementation.py"
-            ], check=True)
+            await self.command_runner.run(self.script_command(
+                "firebase-setup-implementation.py"
+            ), check=True)
             
             print(f"✅ Monitoring setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Monitoring setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.MONITORING, environment, e)
     
     async def setup_backup(self, environment: str) -> bool:
         """Setup Firebase Backup."""
@@ -525,16 +1346,15 @@ class FirebaseOrchestrationSystem:
         
         try:
             # Use our existing backup setup
-            subprocess.run([
-                "python3", "scripts/firebase-backup.py"
-            ], check=True)
+            await self.command_runner.run(self.script_command(
+                "firebase-backup.py"
+            ), check=True)
             
             print(f"✅ Backup setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Backup setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.BACKUP, environment, e)
     
     async def setup_security(self, environment: str) -> bool:
         """Setup Firebase Security."""
@@ -542,16 +1362,15 @@ class FirebaseOrchestrationSystem:
         
         try:
             # Use our existing security setup
-            subprocess.run([
-                "python3", "scripts/service-account-rotation.py"
-            ], check=True)
+            await self.command_runner.run(self.script_command(
+                "service-account-rotation.py"
+            ), check=True)
             
             print(f"✅ Security setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Security setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.SECURITY, environment, e)
     
     async def setup_analytics(self, environment: str) -> bool:
         """Setup Firebase Analytics."""
@@ -561,16 +1380,15 @@ class FirebaseOrchestrationSystem:
             project_id = self.environments[environment].project_id
             
             # Initialize analytics
-            subprocess.run([
-                "firebase", "analytics:report", "--project", project_id
-            ], check=True, capture_output=True)
+            await self.command_runner.run(self.firebase_command(
+                "analytics:report", "--project", project_id
+            ), check=True)
             
             print(f"✅ Analytics setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ Analytics setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.ANALYTICS, environment, e)
     
     async def setup_cicd(self, environment: str) -> bool:
         """Setup CI/CD Pipeline."""
@@ -578,42 +1396,320 @@ class FirebaseOrchestrationSystem:
         
         try:
             # Use our existing CI/CD setup
-            subprocess.run([
-                "python3", "scripts/firebase-setup-implementation.py"
-            ], check=True)
+            await self.command_runner.run(self.script_command(
+                "firebase-setup-implementation.py"
+            ), check=True)
             
             print(f"✅ CI/CD setup complete for {environment}")
             return True
             
-        except subprocess.CalledProcessError:
-            print(f"⚠️ CI/CD setup may need manual configuration for {environment}")
-            return True
+        except subprocess.CalledProcessError as e:
+            return self.handle_setup_failure(IntegrationType.CI_CD, environment, e)
     
-    async def deploy_environment(self, environment: str, integration_types: List[IntegrationType]):
-        """Deploy an entire environment with specified integrations."""
+    async def deploy_environment(self, environment: str, integration_types: List[IntegrationType],
+                                 limiters: Optional[Sequence[asyncio.Semaphore]] = None,
+                                 force: bool = False, resume: bool = False) -> Dict[str, Any]:
+        """Deploy an entire environment with specified integrations.
+        
+        With resume=True and a state store configured, the latest unfinished deployment of the
+        environment is continued and its already completed tasks are not run again.
+        """
+        if environment not in self.environments:
+            raise ValueError(f"Unknown environment: {environment}")
+        
         print(f"🚀 Deploying {environment} environment...")
+        started = time.perf_counter()
         
         # Plan deployment
         tasks = await self.plan_deployment(environment, integration_types)
+        scheduling = self.compare_scheduling_policies(tasks)
+        deployment_id = self.begin_deployment(environment, tasks, resume)
+        
+        # Execute tasks as soon as their dependencies are complete
+        success = False
+        try:
+            success = await self.execute_task_graph(tasks, limiters, force)
+        finally:
+            if self.state_store is not None:
+                self.state_store.finish_deployment(deployment_id, success)
+        
+        print(f"✅ Environment deployment complete: {environment}")
+        return {
+            "environment": environment,
+            "deployment_id": deployment_id,
+            "project_id": self.environments[environment].project_id,
+            "success": success,
+            "duration_seconds": round(time.perf_counter() - started, 3),
+            "scheduling": scheduling,
+            "tasks": {task.id: task.status.value for task in tasks},
+            "completed": [task.id for task in tasks if task.status == TaskStatus.COMPLETED],
+            "failed": [task.id for task in tasks if task.status == TaskStatus.FAILED],
+            "skipped": [task.id for task in tasks if task.status == TaskStatus.SKIPPED],
+            "not_started": [task.id for task in tasks if task.status == TaskStatus.PENDING]
+        }
+    
+    def begin_deployment(self, environment: str, tasks: List[Task], resume: bool = False) -> str:
+        """Register planned tasks with the state store, restoring completed ones when resuming."""
+        deployment_id = None
+        if resume and self.state_store is not None:
+            deployment_id = self.state_store.find_resumable_deployment(environment)
+        
+        if deployment_id is not None:
+            stored_tasks = self.state_store.load_deployment_tasks(deployment_id)
+            resumed = 0
+            for task in tasks:
+                stored = stored_tasks.get(task.integration.value) if task.integration else None
+                if stored is not None and stored["status"] == TaskStatus.COMPLETED.value:
+                    task.started_at = stored["started_at"]
+                    task.completed_at = stored["completed_at"]
+                    task.actual_duration = stored["actual_duration"]
+                    task.retry_count = stored["retry_count"]
+                    # The task is recorded against the deployment below, so this only updates the
+                    # counters, the integration and the event subscribers
+                    self.set_task_status(task, TaskStatus.COMPLETED)
+                    resumed += 1
+            print(f"♻️ Resuming deployment {deployment_id}: {resumed}/{len(tasks)} tasks already completed")
+        else:
+            deployment_id = f"{environment}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+            if self.state_store is not None:
+                self.state_store.start_deployment(
+                    deployment_id, environment, [task.integration.value for task in tasks if task.integration]
+                )
         
-        # Execute tasks
         for task in tasks:
-            success = await self.execute_task(task)
-            if not success and task.max_retries > 0:
-                # Retry failed tasks
-                task.retry_count += 1
-                task.max_retries -= 1
-                task.status = TaskStatus.PENDING
-                success = await self.execute_task(task)
-            
-            if not success:
-                print(f"❌ Critical task failed: {task.name}")
+            self.task_deployments[task.id] = deployment_id
+            if self.state_store is not None:
+                self.state_store.record_task(deployment_id, task)
+        
+        return deployment_id
+    
+    async def deploy_environments(self, deployments: Dict[str, List[IntegrationType]],
+                                  max_concurrent_tasks: Optional[int] = None,
+                                  max_tasks_per_project: Optional[int] = None,
+                                  force: bool = False, resume: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Deploy several environments at once and aggregate the results per environment."""
+        print(f"🚀 Deploying {len(deployments)} environments in parallel...")
+        
+        # One global limit shared by every environment, plus one limit per Firebase project
+        if max_concurrent_tasks is None:
+            global_slots = self.task_slots
+        else:
+            global_slots = asyncio.Semaphore(max(1, max_concurrent_tasks))
+        if max_tasks_per_project is None:
+            max_tasks_per_project = self.config["system"].get("max_concurrent_tasks_per_project")
+        
+        project_slots: Dict[str, asyncio.Semaphore] = {}
+        deployment_runs = []
+        for environment, integration_types in deployments.items():
+            limiters = []
+            # Unknown environments fail in deploy_environment and are reported with the others
+            if max_tasks_per_project and environment in self.environments:
+                project_id = self.environments[environment].project_id
+                if project_id not in project_slots:
+                    project_slots[project_id] = asyncio.Semaphore(max_tasks_per_project)
+                limiters.append(project_slots[project_id])
+            # Project slot first so a task never holds a global slot while waiting on its project
+            limiters.append(global_slots)
+            deployment_runs.append(self.deploy_environment(environment, integration_types, limiters, force, resume))
+        
+        outcomes = await asyncio.gather(*deployment_runs, return_exceptions=True)
+        
+        results = {}
+        for environment, outcome in zip(deployments, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"❌ Deployment of {environment} raised an error: {outcome}")
+                results[environment] = {"environment": environment, "success": False, "error": str(outcome)}
+            else:
+                results[environment] = outcome
+        
+        succeeded = sum(1 for result in results.values() if result["success"])
+        print(f"✅ Parallel deployment complete: {succeeded}/{len(results)} environments succeeded")
+        return results
+    
+    async def execute_task_graph(self, tasks: List[Task],
+                                 limiters: Optional[Sequence[asyncio.Semaphore]] = None,
+                                 force: bool = False) -> bool:
+        """Execute tasks concurrently, starting each one once its dependencies are complete.
+        
+        Tasks that are already COMPLETED (e.g. restored when resuming) are not run again.
+        Tasks whose deployment fingerprint matches a previous success are marked SKIPPED
+        unless force is set; their integration stays deployed. Failed tasks are retried with
+        backoff up to max_retries; a task that still fails has its transitive dependents
+        marked SKIPPED while independent tasks keep running.
+        """
+        if limiters is None:
+            limiters = [self.task_slots]
+        tasks_by_id = {task.id: task for task in tasks}
+        depends_on, dependents = self.build_dependency_graph(tasks)
+        waiting_on: Dict[str, Set[str]] = {task_id: set(ids) for task_id, ids in depends_on.items()}
+        fingerprints: Dict[str, str] = {}
+        if self.deployment_cache is not None:
+            memos: Dict[str, Dict[IntegrationType, str]] = collections.defaultdict(dict)
+            for task in tasks:
+                if task.integration:
+                    fingerprints[task.id] = self.get_deployment_fingerprint(
+                        task.environment, task.integration, memos[task.environment]
+                    )
+        
+        self.task_queue.extend(tasks_by_id)
+        in_flight: Dict[asyncio.Task, str] = {}
+        # Tasks released together are dispatched in scheduling policy order
+        keys = self.get_scheduling_keys(tasks)
+        positions = {task.id: position for position, task in enumerate(tasks)}
+        ready = [(keys[task.id], positions[task.id], task.id) for task in tasks if not waiting_on[task.id]]
+        heapq.heapify(ready)
+        all_succeeded = True
+        
+        def release_dependents(task_id: str):
+            for dependent_id in dependents[task_id]:
+                waiting_on[dependent_id].discard(task_id)
+                if not waiting_on[dependent_id]:
+                    heapq.heappush(ready, (keys[dependent_id], positions[dependent_id], dependent_id))
+        
+        def skip_dependents(failed_task: Task):
+            pending = list(dependents[failed_task.id])
+            while pending:
+                dependent_id = pending.pop()
+                dependent = tasks_by_id[dependent_id]
+                if dependent.status == TaskStatus.SKIPPED:
+                    continue
+                dependent.error_message = f"Skipped because dependency failed: {failed_task.name}"
+                self.set_task_status(dependent, TaskStatus.SKIPPED)
+                self.task_queue.remove(dependent_id)
+                self.skipped_tasks.append(dependent_id)
+                pending.extend(dependents[dependent_id])
+        
+        while ready or in_flight:
+            # Blocking subscribers slow the orchestrator down rather than lose events
+            await self.events.backpressure()
+            
+            # Ready tasks queue on the limiters in scheduling order
+            while ready:
+                _, _, task_id = heapq.heappop(ready)
+                task = tasks_by_id[task_id]
+                if task.status == TaskStatus.COMPLETED:
+                    self.task_queue.remove(task_id)
+                    self.completed_tasks.append(task_id)
+                    release_dependents(task_id)
+                    continue
+                if not force and task_id in fingerprints and self.is_deployment_current(task, fingerprints[task_id]):
+                    self.set_task_status(task, TaskStatus.SKIPPED, update_integration=False)
+                    self.task_queue.remove(task_id)
+                    self.skipped_tasks.append(task_id)
+                    print(f"⏭️ Task unchanged since last deployment, skipping: {task.name}")
+                    release_dependents(task_id)
+                    continue
+                
+                runner = asyncio.create_task(self._run_scheduled_task(task, limiters))
+                in_flight[runner] = task_id
+            
+            if not in_flight:
                 break
+            
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for runner in done:
+                task_id = in_flight.pop(runner)
+                task = tasks_by_id[task_id]
+                
+                if runner.result():
+                    self.completed_tasks.append(task_id)
+                    # Only a deployment whose commands all succeeded may be skipped next time
+                    if task_id in fingerprints and task_id not in self.manual_configuration_tasks:
+                        self.deployment_cache.record_success(
+                            task.environment, task.integration.value, fingerprints[task_id], task_id
+                        )
+                    release_dependents(task_id)
+                elif task.retry_count < task.max_retries:
+                    # Wait out the backoff without holding a slot; other branches keep running
+                    task.retry_count += 1
+                    delay = self.retry_policy.get_delay(task.retry_count)
+                    self.set_task_status(task, TaskStatus.PENDING)
+                    self.task_queue.append(task_id)
+                    if self.events.has_subscribers(TaskRetried):
+                        self.events.publish(TaskRetried(
+                            task.id, task.name, task.environment, self._event_integration(task), task.retry_count, delay
+                        ))
+                    print(f"🔁 Retrying task in {delay:.1f}s ({task.retry_count}/{task.max_retries}): {task.name}")
+                    retry = asyncio.create_task(self._run_scheduled_task(task, limiters, delay))
+                    in_flight[retry] = task_id
+                else:
+                    all_succeeded = False
+                    self.failed_tasks.append(task_id)
+                    # The last successful deployment no longer describes what is deployed
+                    if task_id in fingerprints:
+                        self.deployment_cache.invalidate(task.environment, task.integration.value)
+                    print(f"❌ Task failed after {task.retry_count} retries: {task.name}")
+                    skip_dependents(task)
         
-        print(f"✅ Environment deployment complete: {environment}")
+        if self.deployment_cache is not None:
+            self.deployment_cache.save()
+        if self.duration_history is not None:
+            self.duration_history.save()
+        
+        return all_succeeded
+    
+    async def _run_scheduled_task(self, task: Task, limiters: Sequence[asyncio.Semaphore],
+                                  delay: float = 0) -> bool:
+        """Run a task after an optional delay, once it holds every concurrency slot."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        # A running task publishes its own transitions, so it waits for blocking subscribers
+        # before it starts and after it finishes, without holding a slot
+        await self.events.backpressure()
+        async with contextlib.AsyncExitStack() as slots:
+            for limiter in limiters:
+                await slots.enter_async_context(limiter)
+            
+            self.task_queue.remove(task.id)
+            self.running_tasks.append(task.id)
+            try:
+                succeeded = await self.execute_task(task)
+            finally:
+                self.running_tasks.remove(task.id)
+        await self.events.backpressure()
+        return succeeded
     
-    async def health_check(self) -> Dict[str, Any]:
-        """Perform health check on all environments and integrations."""
+    def get_health_probes(self, environment: str) -> List[Tuple[str, ...]]:
+        """Get the probe commands that decide whether an environment is healthy."""
+        # The firebase CLI lists every project the credentials can access, so one probe serves all
+        return [tuple(self.firebase_command("projects:list"))]
+    
+    async def run_health_probe(self, probe: Tuple[str, ...], force_refresh: bool = False) -> Tuple[datetime, CommandResult]:
+        """Run a health probe, reusing a cached result within the TTL and sharing in-flight runs."""
+        ttl = self.config["system"].get("health_check_cache_ttl_seconds", 60)
+        cached = self.health_probe_cache.get(probe)
+        if cached is not None and not force_refresh and time.monotonic() - cached[0] < ttl:
+            return cached[1], cached[2]
+        
+        if probe not in self._health_probes_in_flight:
+            self._health_probes_in_flight[probe] = asyncio.create_task(self._execute_health_probe(probe))
+        try:
+            checked_at, result = await asyncio.shield(self._health_probes_in_flight[probe])
+        finally:
+            self._health_probes_in_flight.pop(probe, None)
+        return checked_at, result
+    
+    async def _execute_health_probe(self, probe: Tuple[str, ...]) -> Tuple[datetime, CommandResult]:
+        """Run a probe command with the probe timeout and cache its result."""
+        timeout = self.config["system"].get("health_probe_timeout_seconds", 30)
+        try:
+            result = await self.probe_runner.run(probe, timeout=timeout)
+        except CommandTimeoutError as e:
+            result = e.result
+        except OSError as e:
+            result = CommandResult(args=list(probe), exit_code=127, duration=0.0, stdout_tail="", stderr_tail=str(e))
+        
+        checked_at = datetime.now()
+        self.health_probe_cache[probe] = (time.monotonic(), checked_at, result)
+        return checked_at, result
+    
+    async def health_check(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """Perform health check on all environments and integrations.
+        
+        Probe results younger than system.health_check_cache_ttl_seconds are reused
+        unless force_refresh is set.
+        """
         print("🏥 Performing system health check...")
         
         health_status = {
@@ -623,8 +1719,16 @@ class FirebaseOrchestrationSystem:
             "overall_status": "healthy"
         }
         
+        # Each distinct probe runs once per cycle and its result is shared by every environment
+        env_probes = {env_name: self.get_health_probes(env_name) for env_name in self.environments}
+        distinct_probes = list(dict.fromkeys(probe for probes in env_probes.values() for probe in probes))
+        probe_results = dict(zip(
+            distinct_probes,
+            await asyncio.gather(*(self.run_health_probe(probe, force_refresh) for probe in distinct_probes))
+        ))
+        
         # Check environments
-        for env_name, environment in self.environments.items():
+        for env_name, probes in env_probes.items():
             env_health = {
                 "status": "healthy",
                 "last_check": datetime.now().isoformat(),
@@ -632,86 +1736,388 @@ class FirebaseOrchestrationSystem:
             }
             
             # Check if project is accessible
-            try:
-                subprocess.run([
-                    "firebase", "projects:list"
-                ], check=True, capture_output=True)
-            except subprocess.CalledProcessError:
-                env_health["status"] = "unhealthy"
-                env_health["issues"].append("Project not accessible")
+            for probe in probes:
+                checked_at, result = probe_results[probe]
+                env_health["last_check"] = checked_at.isoformat()
+                if not result.ok:
+                    env_health["status"] = "unhealthy"
+                    env_health["issues"].append(
+                        "Project not accessible (probe timed out)" if result.timed_out else "Project not accessible"
+                    )
             
             health_status["environments"][env_name] = env_health
         
         # Check integrations
-        for integration_name, integration in self.integrations.items():
-            integration_health = {
+        last_check = datetime.now().isoformat()
+        for integration_name in self.integrations:
+            health_status["integrations"][integration_name] = {
                 "status": "healthy",
-                "last_check": datetime.now().isoformat(),
+                "last_check": last_check,
                 "issues": []
             }
-            
-            # Basic health check based on integration type
-            if integration.status == TaskStatus.FAILED:
-                integration_health["status"] = "unhealthy"
-                integration_health["issues"].append("Integration failed")
-            
-            health_status["integrations"][integration_name] = integration_health
+        
+        # Basic health check based on integration status
+        failed_integrations = self.integrations.query(status=TaskStatus.FAILED)
+        for integration in failed_integrations:
+            integration_health = health_status["integrations"][integration.name]
+            integration_health["status"] = "unhealthy"
+            integration_health["issues"].append("Integration failed")
         
         # Determine overall status
         unhealthy_count = sum(
             1 for env in health_status["environments"].values() 
             if env["status"] == "unhealthy"
-        ) + sum(
-            1 for integration in health_status["integrations"].values()
-            if integration["status"] == "unhealthy"
-        )
+        ) + len(failed_integrations)
         
         if unhealthy_count > 0:
             health_status["overall_status"] = "degraded" if unhealthy_count < 3 else "unhealthy"
         
+        previous_health, self.latest_health = self.latest_health, health_status
+        self._latest_health_at = time.monotonic()
+        self._publish_health_transitions(previous_health, health_status)
+        await self.events.backpressure()
+        
         print(f"✅ Health check complete: {health_status['overall_status']}")
         return health_status
     
+    def get_cached_health(self) -> Optional[Dict[str, Any]]:
+        """Get the latest health check result without running any probes."""
+        return self.latest_health
+    
+    async def get_current_health(self) -> Dict[str, Any]:
+        """Get the latest health check result while it is current, otherwise run a health check.
+        
+        The result is current while the background monitor is running, or while it is younger
+        than system.health_check_interval_minutes.
+        """
+        if self.latest_health is not None:
+            monitor_running = self._health_monitor is not None and not self._health_monitor.done()
+            max_age = self.config["system"].get("health_check_interval_minutes", 5) * 60
+            if monitor_running or time.monotonic() - self._latest_health_at < max_age:
+                return self.latest_health
+        return await self.health_check()
+    
+    def add_health_listener(self, listener: Callable[[str, Optional[str], str], None]):
+        """Register a callback for health status transitions: listener(component, previous, current)."""
+        self.health_listeners.append(listener)
+    
+    def _publish_health_transitions(self, previous: Optional[Dict[str, Any]], current: Dict[str, Any]):
+        """Notify listeners and event subscribers of every component whose health status changed."""
+        publish_events = self.events.has_subscribers(HealthChanged)
+        if not self.health_listeners and not publish_events:
+            return
+        
+        def statuses(health: Optional[Dict[str, Any]]) -> Dict[str, str]:
+            if health is None:
+                return {}
+            flattened = {"overall": health["overall_status"]}
+            for section in ("environments", "integrations"):
+                for name, component in health[section].items():
+                    flattened[f"{section}/{name}"] = component["status"]
+            return flattened
+        
+        previous_statuses = statuses(previous)
+        for component, status in statuses(current).items():
+            if previous_statuses.get(component) != status:
+                for listener in self.health_listeners:
+                    listener(component, previous_statuses.get(component), status)
+                if publish_events:
+                    self.events.publish(HealthChanged(component, previous_statuses.get(component), status))
+    
+    def start_health_monitor(self) -> asyncio.Task:
+        """Run health checks in the background every system.health_check_interval_minutes."""
+        if self._health_monitor is None or self._health_monitor.done():
+            self._health_monitor = asyncio.create_task(self._run_health_monitor())
+        return self._health_monitor
+    
+    async def stop_health_monitor(self):
+        """Stop the background health checks."""
+        if self._health_monitor is not None:
+            self._health_monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_monitor
+            self._health_monitor = None
+    
+    async def _run_health_monitor(self):
+        """Health check loop; jitter keeps many orchestrators from probing in lockstep."""
+        system_config = self.config["system"]
+        interval = system_config.get("health_check_interval_minutes", 5) * 60
+        jitter = min(system_config.get("health_check_jitter_seconds", 30), interval)
+        
+        while True:
+            try:
+                await self.health_check(force_refresh=True)
+            except Exception as e:
+                print(f"⚠️ Background health check failed: {e}")
+            await asyncio.sleep(max(0.0, interval + random.uniform(-jitter, jitter)))
+    
+    def reload_configuration(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Reload the config file if it changed on disk and apply the differences in place.
+        
+        Only environments and integrations whose configuration changed are rebuilt;
+        tasks, integration status and cached health are kept. Returns the change
+        set, or None when the file is unchanged.
+        """
+        if not os.path.exists(self.config_file):
+            return None
+        mtime = os.stat(self.config_file).st_mtime_ns
+        if mtime == self.config_mtime and not force:
+            return None
+        
+        with open(self.config_file, 'r') as f:
+            new_config = firebase_serialization.load(f)
+        self.config_mtime = mtime
+        
+        changes = self.diff_configuration(self.config, new_config)
+        if not any(changes[section][kind] for section in ("environments", "integrations")
+                   for kind in ("added", "removed", "changed")) and not changes["system"]:
+            return None
+        
+        previous_config, self.config = self.config, new_config
+        try:
+            self.apply_configuration_changes(changes)
+        except Exception:
+            self.config = previous_config
+            raise
+        self.config_hash = self.hash_configuration(self.config)
+        # Templates keyed by the old hash can never be hit again
+        self.plan_cache.clear()
+        self._plan_orders.clear()
+        print(f"🔄 Configuration reloaded: {self._describe_changes(changes)}")
+        for listener in self.config_listeners:
+            listener(changes)
+        self.events.publish(ConfigChanged(changes))
+        return changes
+    
+    @staticmethod
+    def diff_configuration(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        """Added, removed and changed environments and integrations, and changed system keys."""
+        changes: Dict[str, Any] = {}
+        for section in ("environments", "integrations"):
+            old_section, new_section = old.get(section, {}), new.get(section, {})
+            changes[section] = {
+                "added": [name for name in new_section if name not in old_section],
+                "removed": [name for name in old_section if name not in new_section],
+                "changed": [name for name in new_section
+                            if name in old_section and old_section[name] != new_section[name]]
+            }
+        old_system, new_system = old.get("system", {}), new.get("system", {})
+        changes["system"] = sorted(key for key in old_system.keys() | new_system.keys()
+                                   if old_system.get(key) != new_system.get(key))
+        # Objects built once at start-up keep their old settings until a restart
+        changes["restart_required"] = [key for key in changes["system"] if key in RESTART_REQUIRED_SYSTEM_KEYS]
+        return changes
+    
+    def apply_configuration_changes(self, changes: Dict[str, Any]):
+        """Rebuild only the environments and integrations named in a configuration diff."""
+        integration_configs = self.config["integrations"]
+        added_integrations: Set[str] = set()
+        
+        # Build and validate everything new before touching live state
+        rebuilt = {env_name: self._build_environment(env_name, self.config["environments"][env_name])
+                   for env_name in changes["environments"]["added"] + changes["environments"]["changed"]}
+        integration_types = {name: IntegrationType(name) for section in changes["integrations"].values() for name in section}
+        
+        for env_name in changes["environments"]["removed"]:
+            del self.environments[env_name]
+            for name in list(self.integrations.by_environment.get(env_name, {})):
+                del self.integrations[name]
+        
+        for env_name, environment in rebuilt.items():
+            previous = self.environments.get(env_name)
+            if previous is not None:
+                environment.created_at = previous.created_at
+                environment.status = previous.status
+            self.environments[env_name] = environment
+            
+            # Keep integrations the environment still has, with their status
+            current = {integration.type: name
+                       for name, integration in self.integrations.by_environment.get(env_name, {}).items()}
+            for integration_type, name in current.items():
+                if integration_type not in environment.integrations:
+                    del self.integrations[name]
+            for integration_type in environment.integrations:
+                if integration_type not in current and integration_type.value in integration_configs:
+                    added_integrations.add(self._add_integration(
+                        integration_type, integration_configs[integration_type.value], env_name).name)
+        
+        for integration_name in changes["integrations"]["removed"]:
+            for name in list(self.integrations.by_type.get(integration_types[integration_name], {})):
+                del self.integrations[name]
+        
+        for integration_name in changes["integrations"]["changed"]:
+            for integration in self.integrations.by_type.get(integration_types[integration_name], {}).values():
+                integration.configuration = integration_configs[integration_name]
+                integration.last_updated = datetime.now()
+        
+        for integration_name in changes["integrations"]["added"]:
+            integration_type = integration_types[integration_name]
+            for env_name, environment in self.environments.items():
+                if integration_type in environment.integrations and f"{integration_name}_{env_name}" not in self.integrations:
+                    added_integrations.add(self._add_integration(
+                        integration_type, integration_configs[integration_name], env_name).name)
+        
+        if added_integrations:
+            self._restore_integration_statuses(added_integrations)
+        
+        if "retry_policy" in changes["system"]:
+            self.retry_policy = RetryPolicy(**self.config["system"].get("retry_policy", {}))
+    
+    @staticmethod
+    def _describe_changes(changes: Dict[str, Any]) -> str:
+        parts = [
+            f"{len(names)} {kind} {section}"
+            for section in ("environments", "integrations")
+            for kind, names in changes[section].items() if names
+        ]
+        if changes["system"]:
+            parts.append(f"system keys {', '.join(changes['system'])}")
+        return "; ".join(parts)
+    
+    def add_config_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Register a callback for configuration reloads: listener(changes)."""
+        self.config_listeners.append(listener)
+    
+    def start_config_watcher(self) -> asyncio.Task:
+        """Poll the config file every system.config_watch_interval_seconds and reload it when it changes."""
+        if self._config_watcher is None or self._config_watcher.done():
+            self._config_watcher = asyncio.create_task(self._run_config_watcher())
+        return self._config_watcher
+    
+    async def stop_config_watcher(self):
+        """Stop watching the config file."""
+        if self._config_watcher is not None:
+            self._config_watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._config_watcher
+            self._config_watcher = None
+    
+    async def _run_config_watcher(self):
+        """Config polling loop; an mtime check per interval costs one stat call."""
+        while True:
+            await asyncio.sleep(self.config["system"].get("config_watch_interval_seconds", 5))
+            try:
+                self.reload_configuration()
+            except Exception as e:
+                # A half-written or invalid file is retried on the next change
+                print(f"⚠️ Configuration reload failed: {e}")
+            await self.events.backpressure()
+    
     def generate_report(self) -> Dict[str, Any]:
         """Generate comprehensive system report."""
-        report = {
-            "timestamp": datetime.now().isoformat(),
-            "system_info": {
-                "name": self.config["system"]["name"],
-                "version": self.config["system"]["version"],
-                "environments_count": len(self.environments),
-                "integrations_count": len(self.integrations),
-                "tasks_count": len(self.tasks)
-            },
-            "environments": {},
-            "integrations": {},
-            "tasks_summary": {
-                "total": len(self.tasks),
-                "completed": len([t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED]),
-                "failed": len([t for t in self.tasks.values() if t.status == TaskStatus.FAILED]),
-                "pending": len([t for t in self.tasks.values() if t.status == TaskStatus.PENDING])
-            }
+        return materialize(self.generate_report_stream())
+    
+    def generate_report_stream(self, include_tasks: bool = False) -> StreamedObject:
+        """Report whose environment, integration and task sections are produced lazily as it is written.
+        
+        Everything the event loop changes in place (statuses, indexes, counters) is copied up front
+        on the caller's thread, so the report can be written from a worker thread while the event
+        loop keeps changing state. Task rows other than their status are read as they are written.
+        """
+        environments = list(self.environments.values())
+        failed_integrations = {
+            environment.name: [
+                integration.type.value
+                for integration in self.integrations.query(environment=environment.name, status=TaskStatus.FAILED)
+            ]
+            for environment in environments
         }
+        integrations = [
+            (integration, integration.status, integration.last_updated) for integration in self.integrations.values()
+        ]
+        integrations_by_status = self.integrations.status_counts()
+        tasks = [(task, task.status) for task in self.tasks.values()] if include_tasks else []
+        tasks_count = len(self.tasks)
+        tasks_by_status = self.task_counters.summary()
+        tasks_by_environment = [
+            (env_name, self.task_counters.summary(counter))
+            for env_name, counter in self.task_counters.by_environment.items()
+        ]
+        tasks_by_integration = [
+            (integration, self.task_counters.summary(counter))
+            for integration, counter in self.task_counters.by_integration.items()
+        ]
+        # Predicted makespans depend on the plan's integrations and their per-environment estimates,
+        # so environments with the same plan share one comparison, computed here on the caller's thread
+        schedules: Dict[str, Dict[str, Any]] = {}
+        comparisons: Dict[Tuple, Dict[str, Any]] = {}
+        for environment in environments:
+            plan = self.get_plan_template(environment.name, environment.integrations).tasks
+            plan_key = tuple((task.integration, task.estimated_duration) for task in plan)
+            if plan_key not in comparisons:
+                comparisons[plan_key] = self.compare_scheduling_policies(plan)
+            schedules[environment.name] = comparisons[plan_key]
         
-        # Environment details
-        for env_name, environment in self.environments.items():
-            report["environments"][env_name] = {
-                "project_id": environment.project_id,
-                "region": environment.region,
-                "status": environment.status,
-                "integrations": [i.value for i in environment.integrations]
-            }
+        def environment_details():
+            for environment in environments:
+                yield environment.name, {
+                    "project_id": environment.project_id,
+                    "region": environment.region,
+                    "status": environment.status,
+                    "integrations": [i.value for i in environment.integrations],
+                    "failed_integrations": failed_integrations[environment.name]
+                }
+        
+        def integration_details():
+            for integration, status, last_updated in integrations:
+                yield integration.name, {
+                    "type": integration.type.value,
+                    "environment": integration.environment,
+                    "status": status.value,
+                    "last_updated": last_updated.isoformat()
+                }
+        
+        def task_details():
+            for task, status in tasks:
+                yield task.id, {
+                    "name": task.name,
+                    "environment": task.environment,
+                    "integration": task.integration,
+                    "status": status,
+                    "retry_count": task.retry_count,
+                    "created_at": task.created_at,
+                    "started_at": task.started_at,
+                    "completed_at": task.completed_at,
+                    "actual_duration": task.actual_duration,
+                    "error_message": task.error_message
+                }
         
-        # Integration details
-        for integration_name, integration in self.integrations.items():
-            report["integrations"][integration_name] = {
-                "type": integration.type.value,
-                "environment": integration.environment,
-                "status": integration.status.value,
-                "last_updated": integration.last_updated.isoformat()
+        def sections():
+            yield "timestamp", datetime.now().isoformat()
+            yield "system_info", {
+                "name": self.config["system"]["name"],
+                "version": self.config["system"]["version"],
+                "environments_count": len(environments),
+                "integrations_count": len(integrations),
+                "tasks_count": tasks_count
             }
+            yield "environments", StreamedObject(environment_details)
+            yield "integrations", StreamedObject(integration_details)
+            yield "integrations_by_status", integrations_by_status
+            yield "tasks_summary", {
+                "total": tasks_count,
+                "completed": tasks_by_status[TaskStatus.COMPLETED.value],
+                "failed": tasks_by_status[TaskStatus.FAILED.value],
+                "pending": tasks_by_status[TaskStatus.PENDING.value],
+                "by_environment": StreamedObject(lambda: tasks_by_environment),
+                "by_integration": StreamedObject(lambda: tasks_by_integration)
+            }
+            yield "scheduling", StreamedObject(lambda: (
+                (environment.name, schedules[environment.name]) for environment in environments
+            ))
+            if include_tasks:
+                yield "tasks", StreamedObject(task_details)
         
-        return report
+        return StreamedObject(sections)
+    
+    async def save_report(self, report_file: str = "orchestration-report.json", include_tasks: bool = False,
+                          compact: Optional[bool] = None) -> str:
+        """Stream the system report to a file off the event loop."""
+        if compact is None:
+            compact = self.config["system"].get("report_compact", False)
+        await write_json_file_async(report_file, self.generate_report_stream(include_tasks),
+                                    indent=None if compact else 2)
+        return report_file
 
 async def main():
     """Main orchestration system demo."""
@@ -721,40 +2127,28 @@ async def main():
     # Initialize system
     orchestration = FirebaseOrchestrationSystem()
     
-    # Deploy development environment
-    print("\n🚀 Deploying Development Environment...")
-    await orchestration.deploy_environment(
-        "development",
-        [IntegrationType.AUTHENTICATION, IntegrationType.DATABASE, IntegrationType.MONITORING]
-    )
-    
-    # Deploy staging environment
-    print("\n🚀 Deploying Staging Environment...")
-    await orchestration.deploy_environment(
-        "staging",
-        [IntegrationType.AUTHENTICATION, IntegrationType.DATABASE, IntegrationType.STORAGE, IntegrationType.MONITORING]
-    )
-    
-    # Deploy production environment
-    print("\n🚀 Deploying Production Environment...")
-    await orchestration.deploy_environment(
-        "production",
-        [IntegrationType.AUTHENTICATION, IntegrationType.DATABASE, IntegrationType.STORAGE, 
-         IntegrationType.FUNCTIONS, IntegrationType.HOSTING, IntegrationType.MONITORING, 
-         IntegrationType.BACKUP, IntegrationType.SECURITY]
-    )
+    # Deploy all environments in parallel; they are separate Firebase projects
+    print("\n🚀 Deploying Development, Staging and Production Environments...")
+    await orchestration.deploy_environments({
+        "development": [IntegrationType.AUTHENTICATION, IntegrationType.DATABASE, IntegrationType.MONITORING],
+        "staging": [IntegrationType.AUTHENTICATION, IntegrationType.DATABASE, IntegrationType.STORAGE,
+                    IntegrationType.MONITORING],
+        "production": [IntegrationType.AUTHENTICATION, IntegrationType.DATABASE, IntegrationType.STORAGE, 
+                       IntegrationType.FUNCTIONS, IntegrationType.HOSTING, IntegrationType.MONITORING, 
+                       IntegrationType.BACKUP, IntegrationType.SECURITY]
+    })
     
     # Perform health check
     print("\n🏥 Performing Health Check...")
     health_status = await orchestration.health_check()
     
-    # Generate report
+    # Generate and save report
     print("\n📊 Generating System Report...")
-    report = orchestration.generate_report()
+    await orchestration.save_report("orchestration-report.json")
     
-    # Save report
-    with open("orchestration-report.json", "w") as f:
-        json.dump(report, f, indent=2, default=str)
+    await orchestration.command_runner.close()
+    await orchestration.probe_runner.close()
+    orchestration.close()
     
     print("\n🎉 Orchestration System Demo Complete!")
     print(f"📄 Report saved to: orchestration-report.json")
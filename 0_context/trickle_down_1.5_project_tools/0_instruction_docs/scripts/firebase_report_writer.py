@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""
+firebase_report_writer.py
+
+Streaming JSON writer for Firebase orchestration reports.
+Reports are described with lazy objects and arrays that are walked and written
+incrementally, so memory stays flat however large the fleet grows. Values are
+encoded through firebase_serialization, so datetimes and enums are handled natively.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Callable, Iterable, Optional, TextIO, Tuple
+
+# The C encoder for strings, as used by json.dumps
+from json.encoder import encode_basestring_ascii
+
+import firebase_serialization
+from firebase_serialization import encode_default
+
+class StreamedObject:
+    """A JSON object whose (key, value) pairs are produced lazily when written."""
+    __slots__ = ("_pairs",)
+
+    def __init__(self, pairs: Callable[[], Iterable[Tuple[str, Any]]]):
+        self._pairs = pairs
+
+    def __iter__(self):
+        return iter(self._pairs())
+
+    def materialize(self) -> dict:
+        return materialize(self)
+
+class StreamedArray:
+    """A JSON array whose items are produced lazily when written."""
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Callable[[], Iterable[Any]]):
+        self._items = items
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def materialize(self) -> list:
+        return materialize(self)
+
+def _floatstr(value: float) -> str:
+    """Encode a float the way json.dumps does."""
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "Infinity" if value > 0 else "-Infinity"
+    return float.__repr__(value)
+
+def materialize(value: Any) -> Any:
+    """Turn streamed objects and arrays into plain dicts and lists."""
+    if isinstance(value, StreamedObject):
+        return {key: materialize(item) for key, item in value}
+    if isinstance(value, StreamedArray):
+        return [materialize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: materialize(item) for key, item in value.items()}
+    return value
+
+def _has_streamed_children(value: Any) -> bool:
+    """Whether a plain dict or list directly holds streamed values, and so must be walked itself."""
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return False
+    return any(isinstance(item, (StreamedObject, StreamedArray)) for item in value)
+
+def write_json(value: Any, fp: TextIO, indent: Optional[int] = 2):
+    """Write value as JSON, streaming lazy parts; indent=None writes compact JSON.
+    
+    Streamed objects and arrays are walked when they are the value itself or direct
+    children of a plain dict or list; anything nested deeper is encoded whole.
+    """
+    if indent is None:
+        encode = lambda value, depth: firebase_serialization.dumps(value)
+    elif firebase_serialization.BACKEND == "orjson" and indent == 2:
+        # Strings never contain raw newlines, so nested output can be re-indented safely
+        encode = lambda value, depth: firebase_serialization.dumps(value, indent=2).replace("\n", "\n" + "  " * depth)
+    elif hasattr(json.encoder, "_make_iterencode"):
+        # The stdlib's indenting encoder, built once and asked for each value's depth directly
+        iterencode = json.encoder._make_iterencode(
+            {}, encode_default, encode_basestring_ascii, " " * indent, _floatstr,
+            ": ", ",", False, False, False
+        )
+        encode = lambda value, depth: "".join(iterencode(value, depth))
+    else:
+        indented_encoder = json.JSONEncoder(default=encode_default, indent=indent)
+        # Strings never contain raw newlines, so nested output can be re-indented safely
+        encode = lambda value, depth: indented_encoder.encode(value).replace("\n", "\n" + " " * (indent * depth))
+    _write(value, fp, indent, 0, encode)
+    if indent is not None:
+        fp.write("\n")
+
+def _write(value: Any, fp: TextIO, indent: Optional[int], depth: int, encode: Callable[[Any, int], str]):
+    if isinstance(value, (StreamedObject, StreamedArray)) or _has_streamed_children(value):
+        is_object = isinstance(value, (StreamedObject, dict))
+        items = value.items() if isinstance(value, dict) else value
+        fp.write("{" if is_object else "[")
+        if indent is None:
+            separator, newline, closing_newline = ",", "", ""
+        else:
+            separator = ","
+            newline = "\n" + " " * (indent * (depth + 1))
+            closing_newline = "\n" + " " * (indent * depth)
+        empty = True
+        for item in items:
+            fp.write(newline if empty else separator + newline)
+            empty = False
+            if is_object:
+                key, item = item
+                fp.write(encode_basestring_ascii(key if isinstance(key, str) else str(encode_default(key))))
+                fp.write(": " if indent is not None else ":")
+            _write(item, fp, indent, depth + 1, encode)
+        if not empty:
+            fp.write(closing_newline)
+        fp.write("}" if is_object else "]")
+        return
+
+    # Fully materialized values are encoded in one call
+    fp.write(encode(value, depth))
+
+def write_json_file(path: str, value: Any, indent: Optional[int] = 2):
+    """Stream value to a file atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', buffering=1024 * 1024) as f:
+        write_json(value, f, indent)
+    os.replace(temp_path, path)
+
+async def write_json_file_async(path: str, value: Any, indent: Optional[int] = 2):
+    """Stream value to a file from a worker thread, keeping the event loop free."""
+    await asyncio.to_thread(write_json_file, path, value, indent)
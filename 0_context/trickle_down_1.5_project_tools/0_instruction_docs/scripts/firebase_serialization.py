@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+firebase_serialization.py
+
+Serialization layer for the Firebase orchestration system.
+Uses orjson when it is installed and falls back to the standard library json
+module. Datetimes, enums, dataclasses and slotted records are encoded
+explicitly. In typed mode they are tagged so that load(..., typed=True) can
+rebuild the original objects, e.g. IntegrationType lists in architecture plans.
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, IO, Optional, Type
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+TYPE_TAG = "__type__"
+
+# Types that typed decoding can rebuild, by class name
+_registered_types: Dict[str, Type] = {}
+
+def register_type(cls: Type) -> Type:
+    """Class decorator making an Enum, dataclass or slotted record rebuildable by typed decoding."""
+    _registered_types[cls.__name__] = cls
+    return cls
+
+def _record_fields(value: Any) -> Optional[Dict[str, Any]]:
+    """Field values of a dataclass or slotted record (a class with _fields), else None."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    fields = getattr(type(value), "_fields", None)
+    if isinstance(fields, tuple) and not isinstance(value, tuple):
+        return {field: getattr(value, field) for field in fields}
+    return None
+
+def encode_default(value: Any) -> Any:
+    """Encode the non-JSON types used across the orchestration system."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    fields = _record_fields(value)
+    if fields is not None:
+        return fields
+    # Lazily produced report sections, see firebase_report_writer
+    if hasattr(value, "materialize"):
+        return value.materialize()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def to_typed(value: Any) -> Any:
+    """Replace typed values with tagged JSON objects that from_typed can rebuild."""
+    if isinstance(value, dict):
+        return {key.value if isinstance(key, Enum) else key: to_typed(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_typed(item) for item in value]
+    if isinstance(value, datetime):
+        return {TYPE_TAG: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_TAG: "date", "value": value.isoformat()}
+    if isinstance(value, Enum):
+        return {TYPE_TAG: type(value).__name__, "value": value.value}
+    fields = _record_fields(value)
+    if fields is not None:
+        return {TYPE_TAG: type(value).__name__, "fields": to_typed(fields)}
+    return value
+
+def from_typed(value: Any) -> Any:
+    """Rebuild the values tagged by to_typed."""
+    if isinstance(value, list):
+        return [from_typed(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    type_name = value.get(TYPE_TAG)
+    if type_name is None:
+        return {key: from_typed(item) for key, item in value.items()}
+    if type_name == "datetime":
+        return datetime.fromisoformat(value["value"])
+    if type_name == "date":
+        return date.fromisoformat(value["value"])
+
+    cls = _registered_types.get(type_name)
+    if cls is None:
+        raise ValueError(f"Cannot decode unregistered type: {type_name}")
+    if issubclass(cls, Enum):
+        return cls(value["value"])
+    return cls(**from_typed(value["fields"]))
+
+def dumps(value: Any, indent: Optional[int] = None, typed: bool = False) -> str:
+    """Serialize value to a JSON string; indent=None writes compact JSON."""
+    if typed:
+        value = to_typed(value)
+    if orjson is not None and indent in (None, 2):
+        options = orjson.OPT_NON_STR_KEYS
+        if indent is not None:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=encode_default, option=options).decode("utf-8")
+    if indent is None:
+        return json.dumps(value, default=encode_default, separators=(",", ":"))
+    return json.dumps(value, default=encode_default, indent=indent)
+
+def loads(text: Any, typed: bool = False) -> Any:
+    """Parse a JSON string or bytes, rebuilding tagged values when typed is set."""
+    value = orjson.loads(text) if orjson is not None else json.loads(text)
+    return from_typed(value) if typed else value
+
+def dump(value: Any, fp: IO[str], indent: Optional[int] = 2, typed: bool = False):
+    """Serialize value to a text file."""
+    fp.write(dumps(value, indent=indent, typed=typed))
+    if indent is not None:
+        fp.write("\n")
+
+def load(fp: IO[str], typed: bool = False) -> Any:
+    """Parse a JSON text file."""
+    return loads(fp.read(), typed=typed)
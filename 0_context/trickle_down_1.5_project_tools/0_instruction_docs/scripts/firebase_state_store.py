@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+"""
+firebase_state_store.py
+
+Durable state store for the Firebase orchestration system.
+Records deployments, task state changes and integration status in a
+WAL-mode SQLite database so an interrupted deployment can be resumed.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    id TEXT PRIMARY KEY,
+    environment TEXT NOT NULL,
+    integrations TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS deployments_by_environment ON deployments (environment, started_at);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    deployment_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    environment TEXT NOT NULL,
+    integration TEXT,
+    status TEXT NOT NULL,
+    retry_count INTEGER NOT NULL,
+    started_at REAL,
+    completed_at REAL,
+    actual_duration REAL,
+    error_message TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (deployment_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS task_transitions (
+    deployment_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS integrations (
+    name TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    environment TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_updated REAL NOT NULL
+);
+"""
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Convert an optional datetime to epoch seconds."""
+    return value.timestamp() if value is not None else None
+
+class SQLiteStateStore:
+    """WAL-mode SQLite store for deployment, task and integration state."""
+
+    def __init__(self, db_path: str = "orchestration-state.db", batch_size: int = 50,
+                 flush_interval_seconds: float = 1.0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        # Latest row per task/integration plus the ordered transition log, written in one batch
+        self._pending_tasks: Dict[Tuple[str, str], tuple] = {}
+        self._pending_transitions: List[tuple] = []
+        self._pending_integrations: Dict[str, tuple] = {}
+        self._last_flush = time.monotonic()
+
+    def start_deployment(self, deployment_id: str, environment: str, integrations: List[str]):
+        """Record the start of a deployment."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO deployments (id, environment, integrations, status, started_at, finished_at) "
+                "VALUES (?, ?, ?, 'running', ?, NULL)",
+                (deployment_id, environment, json.dumps(integrations), time.time())
+            )
+
+    def finish_deployment(self, deployment_id: str, success: bool):
+        """Flush pending state and mark a deployment finished."""
+        self.flush()
+        with self.connection:
+            self.connection.execute(
+                "UPDATE deployments SET status = ?, finished_at = ? WHERE id = ?",
+                ("completed" if success else "failed", time.time(), deployment_id)
+            )
+
+    def find_resumable_deployment(self, environment: str) -> Optional[str]:
+        """Id of the latest deployment of an environment that did not complete, if any."""
+        self.flush()
+        row = self.connection.execute(
+            "SELECT id, status FROM deployments WHERE environment = ? ORDER BY started_at DESC LIMIT 1",
+            (environment,)
+        ).fetchone()
+        if row is None or row[1] == "completed":
+            return None
+        return row[0]
+
+    def load_deployment_tasks(self, deployment_id: str) -> Dict[str, Dict[str, Any]]:
+        """Stored task state for a deployment, keyed by integration type."""
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT id, integration, status, retry_count, started_at, completed_at, actual_duration, error_message "
+            "FROM tasks WHERE deployment_id = ? AND integration IS NOT NULL",
+            (deployment_id,)
+        ).fetchall()
+        return {
+            row[1]: {
+                "id": row[0],
+                "status": row[2],
+                "retry_count": row[3],
+                "started_at": datetime.fromtimestamp(row[4]) if row[4] is not None else None,
+                "completed_at": datetime.fromtimestamp(row[5]) if row[5] is not None else None,
+                "actual_duration": row[6],
+                "error_message": row[7]
+            }
+            for row in rows
+        }
+
+    def load_integration_statuses(self) -> Dict[str, str]:
+        """Last recorded status of every integration, keyed by integration name."""
+        self.flush()
+        return dict(self.connection.execute("SELECT name, status FROM integrations").fetchall())
+
+    def record_task(self, deployment_id: str, task):
+        """Queue a task state change for the next batched write."""
+        now = time.time()
+        self._pending_tasks[(deployment_id, task.id)] = (
+            deployment_id,
+            task.id,
+            task.name,
+            task.environment,
+            task.integration.value if task.integration else None,
+            task.status.value,
+            task.retry_count,
+            _timestamp(task.started_at),
+            _timestamp(task.completed_at),
+            task.actual_duration,
+            task.error_message,
+            now
+        )
+        self._pending_transitions.append((deployment_id, task.id, task.status.value, now))
+        # Completions are resume checkpoints, so they flush the batch immediately
+        if task.status.value == "completed":
+            self.flush()
+        else:
+            self._maybe_flush()
+
+    def record_integration(self, integration):
+        """Queue an integration status change for the next batched write."""
+        self._pending_integrations[integration.name] = (
+            integration.name,
+            integration.type.value,
+            integration.environment,
+            integration.status.value,
+            _timestamp(integration.last_updated)
+        )
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        """Flush when the batch is full or the flush interval has passed."""
+        pending = len(self._pending_transitions) + len(self._pending_integrations)
+        if pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+            self.flush()
+
+    def flush(self):
+        """Write all pending state changes in a single transaction."""
+        self._last_flush = time.monotonic()
+        if not (self._pending_tasks or self._pending_transitions or self._pending_integrations):
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO tasks (deployment_id, id, name, environment, integration, status, "
+                "retry_count, started_at, completed_at, actual_duration, error_message, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                list(self._pending_tasks.values())
+            )
+            self.connection.executemany(
+                "INSERT INTO task_transitions (deployment_id, task_id, status, recorded_at) VALUES (?, ?, ?, ?)",
+                self._pending_transitions
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO integrations (name, type, environment, status, last_updated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                list(self._pending_integrations.values())
+            )
+
+        self._pending_tasks.clear()
+        self._pending_transitions.clear()
+        self._pending_integrations.clear()
+
+    def close(self):
+        """Flush pending state and close the database."""
+        self.flush()
+        self.connection.close()
@@ -8,16 +8,20 @@ This provides a comprehensive dashboard and planning interface for agentic AI.
 """
 
 import asyncio
-import json
+import collections
+import contextlib
+import dataclasses
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch
-import networkx as nx
+from typing import Deque, Dict, List, Optional, Any
 from dataclasses import dataclass
+from firebase_event_bus import (
+    HealthChanged, IntegrationStatusChanged, OrchestrationEvent, TaskCompleted, TaskFailed, TaskQueued,
+    TaskRetried, TaskSkipped, TaskStarted
+)
 from firebase_orchestration_system import FirebaseOrchestrationSystem, EnvironmentType, IntegrationType, TaskStatus
+from firebase_orchestration_context import OrchestrationContext
+from firebase_report_writer import write_json_file
 
 @dataclass
 class VisualPlan:
@@ -36,27 +40,37 @@ class FirebaseVisualOrchestrator:
         self.orchestration = orchestration_system
         self.plans: Dict[str, VisualPlan] = {}
         self.dashboard_data: Dict[str, Any] = {}
+        self.recent_events: Deque[OrchestrationEvent] = collections.deque(maxlen=50)
+        self._event_feed: Optional[asyncio.Task] = None
     
     def create_deployment_plan(self, plan_name: str, environments: List[str], 
                              integrations: List[IntegrationType]) -> VisualPlan:
         """Create a visual deployment plan."""
         print(f"📋 Creating deployment plan: {plan_name}")
         
-        # Calculate dependencies
-        dependencies = {}
-        for integration in integrations:
-            dependencies[integration.value] = self.orchestration.get_integration_dependencies(integration)
-        
-        # Calculate timeline
+        # Dependencies and durations come from the orchestration system's cached plan
+        # templates, so refreshing a plan for the same inputs is a lookup
+        templates = {env: self.orchestration.get_plan_template(env, integrations) for env in environments}
+        template = templates[environments[0]] if environments else self.orchestration.get_plan_template("", integrations)
+        dependencies = template.dependencies()
+        
+        # Calculate timeline: environments deploy one after another, each taking its predicted
+        # makespan under the learned task durations
+        slots = self.orchestration.get_default_task_slots()
+        environment_durations = {
+            env: self.orchestration.predict_makespan(env_template.tasks, slots)
+            for env, env_template in templates.items()
+        }
         timeline = {}
         current_time = datetime.now()
         for env in environments:
             timeline[env] = current_time
-            current_time += timedelta(hours=2)  # 2 hours between environments
+            current_time += timedelta(minutes=environment_durations[env])
         
         # Calculate resources
         resources = {
-            "estimated_duration": sum(self.orchestration.get_estimated_duration(i) for i in integrations),
+            "estimated_duration": template.estimated_duration,
+            "environment_durations": environment_durations,
             "required_services": [i.value for i in integrations],
             "complexity_score": len(integrations) * len(environments)
         }
@@ -80,6 +94,9 @@ class FirebaseVisualOrchestrator:
         
         plan = self.plans[plan_name]
         
+        # Plotting libraries are slow to import, so they load only when drawing
+        import matplotlib.pyplot as plt
+        
         # Create figure
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 12))
         fig.suptitle(f'Firebase Deployment Plan: {plan_name}', fontsize=16, fontweight='bold')
@@ -119,7 +136,7 @@ class FirebaseVisualOrchestrator:
             
             # Simple bar
             env_color = env_colors.get(env, '#9E9E9E')
-            duration_hours = plan.resources['estimated_duration'] / len(plan.environments)
+            duration_hours = plan.resources['environment_durations'][env] / 60
             
             ax.barh(y_pos, duration_hours, height=0.6, color=env_color, alpha=0.7, 
                    edgecolor='black', linewidth=1)
@@ -160,10 +177,11 @@ class FirebaseVisualOrchestrator:
         ax.grid(True, alpha=0.3)
         
         # Legend
+        from matplotlib.lines import Line2D
         legend_elements = []
         for integration in plan.integrations:
             color = integration_colors.get(integration.value, '#9E9E9E')
-            legend_elements.append(plt.Line2D([0], [0], marker='o', color='w', 
+            legend_elements.append(Line2D([0], [0], marker='o', color='w', 
                                              markerfacecolor=color, markersize=8, 
                                              label=integration.value.title()))
         ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.15, 1))
@@ -172,6 +190,8 @@ class FirebaseVisualOrchestrator:
         """Create dependency graph visualization."""
         ax.set_title('Integration Dependencies', fontsize=14, fontweight='bold')
         
+        import networkx as nx
+        
         # Create directed graph
         G = nx.DiGraph()
         
@@ -233,6 +253,7 @@ class FirebaseVisualOrchestrator:
             },
             "environment_status": {},
             "integration_status": {},
+            "integration_status_counts": self.orchestration.integrations.status_counts(),
             "task_summary": {
                 "completed": 0,
                 "failed": 0,
@@ -242,7 +263,9 @@ class FirebaseVisualOrchestrator:
             "health_metrics": {
                 "overall_health": "healthy",
                 "critical_issues": 0,
-                "warnings": 0
+                "warnings": 0,
+                "probe_status": None,
+                "last_health_check": None
             },
             "resource_utilization": {
                 "cpu_usage": "low",
@@ -257,6 +280,9 @@ class FirebaseVisualOrchestrator:
                 "project_id": environment.project_id,
                 "status": environment.status,
                 "integrations_count": len(environment.integrations),
+                "failed_integrations_count": len(
+                    self.orchestration.integrations.query(environment=env_name, status=TaskStatus.FAILED)
+                ),
                 "last_updated": environment.created_at.isoformat()
             }
         
@@ -269,36 +295,104 @@ class FirebaseVisualOrchestrator:
                 "last_updated": integration.last_updated.isoformat()
             }
         
-        # Task summary
-        for task in self.orchestration.tasks.values():
-            if task.status == TaskStatus.COMPLETED:
-                dashboard["task_summary"]["completed"] += 1
-            elif task.status == TaskStatus.FAILED:
-                dashboard["task_summary"]["failed"] += 1
-            elif task.status == TaskStatus.PENDING:
-                dashboard["task_summary"]["pending"] += 1
-            elif task.status == TaskStatus.IN_PROGRESS:
-                dashboard["task_summary"]["in_progress"] += 1
-        
-        # Health metrics
+        # Task summary and health metrics
+        self._update_task_metrics(dashboard)
+        
+        # Latest probe results, without running the CLI
+        cached_health = self.orchestration.get_cached_health()
+        if cached_health is not None:
+            dashboard["health_metrics"]["probe_status"] = cached_health["overall_status"]
+            dashboard["health_metrics"]["last_health_check"] = cached_health["timestamp"]
+        
+        dashboard["recent_activity"] = self._recent_activity()
+        
+        self.dashboard_data = dashboard
+        return dashboard
+    
+    def _update_task_metrics(self, dashboard: Dict[str, Any]):
+        """Refresh the task summary and the health metrics derived from it."""
+        dashboard["system_overview"]["total_tasks"] = len(self.orchestration.tasks)
+        for status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
+            dashboard["task_summary"][status.value] = self.orchestration.task_counters.count(status)
+        
         failed_tasks = dashboard["task_summary"]["failed"]
+        health_metrics = dashboard["health_metrics"]
+        health_metrics["warnings"] = health_metrics["critical_issues"] = 0
         if failed_tasks == 0:
-            dashboard["health_metrics"]["overall_health"] = "healthy"
+            health_metrics["overall_health"] = "healthy"
         elif failed_tasks < 3:
-            dashboard["health_metrics"]["overall_health"] = "degraded"
-            dashboard["health_metrics"]["warnings"] = failed_tasks
+            health_metrics["overall_health"] = "degraded"
+            health_metrics["warnings"] = failed_tasks
         else:
-            dashboard["health_metrics"]["overall_health"] = "unhealthy"
-            dashboard["health_metrics"]["critical_issues"] = failed_tasks
-        
-        self.dashboard_data = dashboard
-        return dashboard
+            health_metrics["overall_health"] = "unhealthy"
+            health_metrics["critical_issues"] = failed_tasks
+    
+    def _recent_activity(self) -> List[Dict[str, Any]]:
+        return [self._describe_event(event) for event in self.recent_events]
+    
+    @staticmethod
+    def _describe_event(event: OrchestrationEvent) -> Dict[str, Any]:
+        return {"event": type(event).__name__, **dataclasses.asdict(event)}
+    
+    def apply_event(self, event: OrchestrationEvent):
+        """Update the dashboard data in place for one orchestration event."""
+        self.recent_events.append(event)
+        dashboard = self.dashboard_data
+        if not dashboard:
+            return
+        
+        if isinstance(event, IntegrationStatusChanged):
+            integration = self.orchestration.integrations.get(event.integration)
+            if integration is not None and event.integration in dashboard["integration_status"]:
+                dashboard["integration_status"][event.integration].update(
+                    status=event.status, last_updated=integration.last_updated.isoformat()
+                )
+            dashboard["integration_status_counts"] = self.orchestration.integrations.status_counts()
+            if event.environment in dashboard["environment_status"]:
+                dashboard["environment_status"][event.environment]["failed_integrations_count"] = len(
+                    self.orchestration.integrations.query(environment=event.environment, status=TaskStatus.FAILED)
+                )
+        elif isinstance(event, (TaskQueued, TaskStarted, TaskRetried, TaskCompleted, TaskFailed, TaskSkipped)):
+            self._update_task_metrics(dashboard)
+        elif isinstance(event, HealthChanged) and event.component == "overall":
+            dashboard["health_metrics"]["probe_status"] = event.status
+            dashboard["health_metrics"]["last_health_check"] = event.timestamp.isoformat()
+        
+        activity = dashboard.setdefault("recent_activity", [])
+        activity.append(self._describe_event(event))
+        del activity[:-self.recent_events.maxlen]
+        dashboard["timestamp"] = datetime.now().isoformat()
+    
+    def start_event_feed(self, maxsize: int = 1000) -> asyncio.Task:
+        """Keep the dashboard data current from orchestration events instead of rebuilding it."""
+        if self._event_feed is None or self._event_feed.done():
+            # A live view prefers fresh events, so the oldest are dropped if it falls behind
+            subscription = self.orchestration.events.subscribe(maxsize=maxsize, overflow="drop_oldest")
+            self._event_feed = asyncio.create_task(self._run_event_feed(subscription))
+        return self._event_feed
+    
+    async def stop_event_feed(self):
+        """Stop following orchestration events."""
+        if self._event_feed is not None:
+            self._event_feed.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._event_feed
+            self._event_feed = None
+    
+    async def _run_event_feed(self, subscription):
+        try:
+            async for event in subscription:
+                self.apply_event(event)
+        finally:
+            subscription.close()
     
     def visualize_dashboard(self) -> str:
         """Create visual dashboard."""
         if not self.dashboard_data:
             self.create_dashboard()
         
+        import matplotlib.pyplot as plt
+        
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('Firebase Orchestration Dashboard', fontsize=16, fontweight='bold')
         
@@ -457,8 +551,8 @@ class FirebaseVisualOrchestrator:
         
         # Save report
         report_file = f"comprehensive-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        compact = self.orchestration.config["system"].get("report_compact", False)
+        write_json_file(report_file, report, indent=None if compact else 2)
         
         print(f"📄 Comprehensive report saved: {report_file}")
         return report_file
@@ -502,11 +596,10 @@ async def main():
     print("🎨 FIREBASE VISUAL ORCHESTRATOR DEMO")
     print("=" * 60)
     
-    # Initialize orchestration system
-    orchestration = FirebaseOrchestrationSystem()
-    
-    # Initialize visual orchestrator
-    visual_orchestrator = FirebaseVisualOrchestrator(orchestration)
+    # Initialize orchestration system and visual orchestrator
+    context = OrchestrationContext()
+    orchestration = context.system
+    visual_orchestrator = context.visual
     
     # Create deployment plans
     print("\n📋 Creating deployment plans...")